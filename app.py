@@ -13,12 +13,13 @@ import zipfile
 from io import BytesIO
 import base64
 import hashlib
+import hmac
 import json
+import sqlite3
+from contextlib import contextmanager
 
-# Import our modules
+# Import our modules (utils and charts are imported lazily inside the tabs that use them)
 from data import DatabaseManager, create_sample_data
-from utils import TradingCalculator, DataExporter, AIInsights, CurrencyConverter
-from charts import ChartGenerator, ChartExporter
 
 # Page configuration
 st.set_page_config(
@@ -28,6 +29,71 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Custom CSS for better styling
+CUSTOM_CSS = """
+<style>
+    .main-header {
+        font-size: 3rem;
+        font-weight: bold;
+        color: #2E86AB;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        color: #666;
+        text-align: center;
+        margin-bottom: 3rem;
+    }
+    .metric-card {
+        background-color: #f8f9fa;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border-left: 4px solid #2E86AB;
+        margin: 0.5rem 0;
+    }
+    .success-message {
+        background-color: #d4edda;
+        color: #155724;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border: 1px solid #c3e6cb;
+    }
+    .error-message {
+        background-color: #f8d7da;
+        color: #721c24;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border: 1px solid #f5c6cb;
+    }
+    .warning-message {
+        background-color: #fff3cd;
+        color: #856404;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border: 1px solid #ffeaa7;
+    }
+    .login-container {
+        max-width: 400px;
+        margin: 0 auto;
+        padding: 2rem;
+        background: white;
+        border-radius: 10px;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+    }
+    .language-selector {
+        position: fixed;
+        top: 10px;
+        right: 10px;
+        z-index: 1000;
+    }
+</style>
+"""
+
+# Calendar selector choices; module-level so reruns don't rebuild them
+CALENDAR_YEARS = tuple(range(2020, 2030))
+CALENDAR_MONTHS = tuple(range(1, 13))
+
 # Language and Login Management
 class LanguageManager:
     def __init__(self):
@@ -71,45 +137,94 @@ class LanguageManager:
                 'about': '關於'
             }
         }
+        # Flat (lang, key) lookup table so get_text is a single hash probe
+        self.flat = {(code, key): text for code, texts in self.languages.items() for key, text in texts.items()}
+        # Per-language tables with English fallback, bound once per rerun via texts()
+        self.tables = {code: {**self.languages['en'], **texts} for code, texts in self.languages.items()}
     
     def get_text(self, key, lang='en'):
-        return self.languages.get(lang, self.languages['en']).get(key, key)
+        return self.flat.get((lang, key)) or self.flat.get(('en', key), key)
+    
+    def texts(self, lang='en'):
+        return self.tables.get(lang, self.tables['en'])
 
 class UserManager:
-    def __init__(self):
-        self.users_file = "users.json"
-        self.load_users()
+    def __init__(self, db_path="auth.db", legacy_users_file="users.json"):
+        self.db_path = db_path
+        self.users_file = legacy_users_file
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "username TEXT PRIMARY KEY, salt BLOB, hash BLOB NOT NULL, created_at TEXT)"
+            )
+        self.import_legacy_users()
     
-    def load_users(self):
-        if os.path.exists(self.users_file):
-            with open(self.users_file, 'r') as f:
-                self.users = json.load(f)
-        else:
-            self.users = {}
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def import_legacy_users(self):
+        """Copy accounts from the old users.json file; existing usernames are left untouched"""
+        if not os.path.exists(self.users_file):
+            return
+        
+        with open(self.users_file, 'r') as f:
+            users = json.load(f)
+        
+        rows = []
+        for username, user in users.items():
+            if 'salt' in user:
+                rows.append((username, bytes.fromhex(user['salt']), bytes.fromhex(user['hash']), user.get('created_at')))
+            else:
+                # Unsalted SHA-256 record; a NULL salt marks it for upgrade on next login
+                rows.append((username, None, bytes.fromhex(user['password']), user.get('created_at')))
+        
+        with self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO users (username, salt, hash, created_at) VALUES (?, ?, ?, ?)", rows)
     
-    def save_users(self):
-        with open(self.users_file, 'w') as f:
-            json.dump(self.users, f)
+    def hash_password(self, password, salt):
+        return hashlib.scrypt(password.encode(), salt=salt, n=2**14, r=8, p=1, dklen=32)
     
-    def hash_password(self, password):
-        return hashlib.sha256(password.encode()).hexdigest()
+    def _set_password(self, username, password):
+        salt = os.urandom(16)
+        with self._connect() as conn:
+            conn.execute("UPDATE users SET salt = ?, hash = ? WHERE username = ?",
+                         (salt, self.hash_password(password, salt), username))
     
     def register_user(self, username, password):
-        if username in self.users:
+        salt = os.urandom(16)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO users (username, salt, hash, created_at) VALUES (?, ?, ?, ?)",
+                (username, salt, self.hash_password(password, salt), datetime.now().isoformat())
+            )
+        
+        if cursor.rowcount == 0:
             return False, "Username already exists"
-        
-        self.users[username] = {
-            'password': self.hash_password(password),
-            'created_at': datetime.now().isoformat()
-        }
-        self.save_users()
         return True, "User registered successfully"
     
     def login_user(self, username, password):
-        if username not in self.users:
+        with self._connect() as conn:
+            row = conn.execute("SELECT salt, hash FROM users WHERE username = ?", (username,)).fetchone()
+        
+        if row is None:
             return False, "User not found"
         
-        if self.users[username]['password'] != self.hash_password(password):
+        salt, stored_hash = row
+        
+        # Legacy accounts store an unsalted SHA-256; upgrade them on first login
+        if salt is None:
+            if not hmac.compare_digest(stored_hash, hashlib.sha256(password.encode()).digest()):
+                return False, "Invalid password"
+            self._set_password(username, password)
+            return True, "Login successful"
+        
+        if not hmac.compare_digest(stored_hash, self.hash_password(password, salt)):
             return False, "Invalid password"
         
         return True, "Login successful"
@@ -117,9 +232,122 @@ class UserManager:
     def get_user_database(self, username):
         return f"trades_{username}.db"
 
+@st.cache_resource
+def get_lang_manager():
+    """Build the language tables once per server process"""
+    return LanguageManager()
+
+def trades_cache_key(username, version, trades_df):
+    """Cache key for a user's trades: owner, DB version and a hash of the contents"""
+    # Row count and newest id are not enough: SQLite reuses rowids after a reset or delete,
+    # and edits change rows without changing either
+    content = pd.util.hash_pandas_object(trades_df, index=False).to_numpy().tobytes()
+    return (username, version, hash(content))
+
+@st.cache_data(show_spinner=False)
+def dashboard_metrics(fingerprint, _trades_df):
+    """Headline numbers for the dashboard and sidebar, computed in one pass per data change"""
+    realized = _trades_df['realized_pnl'].to_numpy(dtype=float)
+    unrealized = _trades_df['unrealized_pnl'].to_numpy(dtype=float)
+    
+    closed = np.count_nonzero(realized)
+    wins = np.count_nonzero(realized > 0)
+    
+    return {
+        'total_trades': len(_trades_df),
+        'total_pnl': float(np.nansum(realized) + np.nansum(unrealized)),
+        'win_rate': wins / closed * 100 if closed else None,
+        # ticker is categorical (see data.CATEGORICAL_COLUMNS); count only categories still in use
+        'unique_tickers': _trades_df['ticker'].cat.remove_unused_categories().cat.categories.size
+    }
+
+@st.cache_data(show_spinner=False)
+def filter_options(fingerprint, _trades_df):
+    """Ticker/asset choices and date bounds for the analysis filters, scanned once per data change"""
+    return (
+        _trades_df['ticker'].unique().tolist(),
+        _trades_df['asset_type'].unique().tolist(),
+        _trades_df['date'].min().date(),
+        _trades_df['date'].max().date()
+    )
+
+@st.cache_data(show_spinner=False)
+def calendar_index(fingerprint, _trades_df):
+    """Trade row positions sorted by calendar day, so any month or year is one contiguous slice"""
+    days = _trades_df['date'].to_numpy(dtype='datetime64[D]')
+    valid = np.flatnonzero(~np.isnat(days))
+    order = valid[np.argsort(days[valid], kind='stable')]
+    return days[order], order
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def build_chart(chart_type, fingerprint, _trades_df):
+    """Plotly figure for a chart type; switching back to an already built chart is a cache hit"""
+    from charts import CHART_BUILDERS
+    
+    return CHART_BUILDERS[chart_type](_trades_df)
+
+@st.cache_data(show_spinner=False)
+def trade_insights(fingerprint, _trades_df):
+    """Rule-based insights and per-ticker realized P&L, recomputed only when the trades change"""
+    from utils import AIInsights
+    
+    ticker_pnl = _trades_df.groupby('ticker', observed=True)['realized_pnl'].sum()
+    insights = AIInsights.generate_insights(_trades_df, ticker_pnl)
+    return insights, ticker_pnl
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def calendar_heatmap(daily_pnl):
+    """Calendar heatmap for one selected period of the Calendar tab"""
+    # Keyed on the daily totals themselves (at most one row per day of the period, cheap to hash)
+    from charts import ChartGenerator
+    
+    return ChartGenerator.create_pnl_calendar_heatmap(daily_pnl)
+
+@st.cache_resource
+def get_user_manager():
+    """Open the accounts database (and import any legacy users.json) once per server process"""
+    return UserManager()
+
 # Initialize managers
-lang_manager = LanguageManager()
-user_manager = UserManager()
+lang_manager = get_lang_manager()
+user_manager = get_user_manager()
+
+@st.cache_resource
+def get_db(username):
+    """One DatabaseManager per user, shared across reruns"""
+    return DatabaseManager(user_manager.get_user_database(username))
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_trades(username, version):
+    """Trades for a user and their cache key; the DB version changes on every write so stale frames are never served"""
+    trades_df = get_db(username).get_trades()
+    return trades_df, trades_cache_key(username, version, trades_df)
+
+def reload_trades():
+    """Point the session at the current user's latest trades"""
+    st.session_state.trades_df, st.session_state.trades_key = load_trades(
+        st.session_state.username, st.session_state.db.version
+    )
+
+# Rows sent to the browser per page for potentially large tables
+PAGE_SIZE = 50
+
+def paged_dataframe(df, key, **kwargs):
+    """Show one page of df; only that window is serialized to the browser"""
+    if len(df) <= PAGE_SIZE:
+        st.dataframe(df, **kwargs)
+        return
+    
+    n_pages = -(-len(df) // PAGE_SIZE)
+    # The page number lives only in Session State; a filter may have shrunk the result since it was chosen
+    st.session_state.setdefault(key, 1)
+    if st.session_state[key] > n_pages:
+        st.session_state[key] = n_pages
+    page = st.number_input("Page", min_value=1, max_value=n_pages, key=key)
+    
+    start = (page - 1) * PAGE_SIZE
+    st.dataframe(df.iloc[start:start + PAGE_SIZE], **kwargs)
+    st.caption(f"Page {page} of {n_pages}: rows {start + 1}-{min(start + PAGE_SIZE, len(df))} of {len(df)}")
 
 # Initialize session state
 if 'authenticated' not in st.session_state:
@@ -129,66 +357,8 @@ if 'username' not in st.session_state:
 if 'language' not in st.session_state:
     st.session_state.language = 'en'
 
-# Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 3rem;
-        font-weight: bold;
-        color: #2E86AB;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .sub-header {
-        font-size: 1.5rem;
-        color: #666;
-        text-align: center;
-        margin-bottom: 3rem;
-    }
-    .metric-card {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #2E86AB;
-        margin: 0.5rem 0;
-    }
-    .success-message {
-        background-color: #d4edda;
-        color: #155724;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid #c3e6cb;
-    }
-    .error-message {
-        background-color: #f8d7da;
-        color: #721c24;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid #f5c6cb;
-    }
-    .warning-message {
-        background-color: #fff3cd;
-        color: #856404;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border: 1px solid #ffeaa7;
-    }
-    .login-container {
-        max-width: 400px;
-        margin: 0 auto;
-        padding: 2rem;
-        background: white;
-        border-radius: 10px;
-        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-    }
-    .language-selector {
-        position: fixed;
-        top: 10px;
-        right: 10px;
-        z-index: 1000;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for better styling; style-only st.html goes to the event container, not the layout
+st.html(CUSTOM_CSS)
 
 # Language selector
 with st.container():
@@ -202,24 +372,25 @@ with st.container():
 
 # Get current language
 lang = st.session_state.language
+L = lang_manager.texts(lang)
 
 # Login Page
 if not st.session_state.authenticated:
     st.markdown('<div class="login-container">', unsafe_allow_html=True)
     
-    st.markdown(f'<h1 style="text-align: center; color: #2E86AB;">📈 {lang_manager.get_text("title", lang)}</h1>', unsafe_allow_html=True)
+    st.markdown(f'<h1 style="text-align: center; color: #2E86AB;">📈 {L["title"]}</h1>', unsafe_allow_html=True)
     
     # Login/Register tabs
-    login_tab, register_tab = st.tabs([lang_manager.get_text("login", lang), lang_manager.get_text("register", lang)])
+    login_tab, register_tab = st.tabs([L["login"], L["register"]])
     
     with login_tab:
         with st.form("login_form"):
-            st.markdown(f"### {lang_manager.get_text('welcome', lang)}")
+            st.markdown(f"### {L['welcome']}")
             
-            username = st.text_input(lang_manager.get_text("username", lang))
-            password = st.text_input(lang_manager.get_text("password", lang), type="password")
+            username = st.text_input(L["username"])
+            password = st.text_input(L["password"], type="password")
             
-            submitted = st.form_submit_button(lang_manager.get_text("login_button", lang), width='stretch')
+            submitted = st.form_submit_button(L["login_button"], width='stretch')
             
             if submitted:
                 if username and password:
@@ -228,9 +399,8 @@ if not st.session_state.authenticated:
                         st.session_state.authenticated = True
                         st.session_state.username = username
                         # Initialize user-specific database
-                        user_db_path = user_manager.get_user_database(username)
-                        st.session_state.db = DatabaseManager(user_db_path)
-                        st.session_state.trades_df = st.session_state.db.get_trades()
+                        st.session_state.db = get_db(username)
+                        reload_trades()
                         st.success(f"✅ {message}")
                         st.rerun()
                     else:
@@ -240,13 +410,13 @@ if not st.session_state.authenticated:
     
     with register_tab:
         with st.form("register_form"):
-            st.markdown(f"### {lang_manager.get_text('register', lang)}")
+            st.markdown(f"### {L['register']}")
             
-            username = st.text_input(lang_manager.get_text("username", lang))
-            password = st.text_input(lang_manager.get_text("password", lang), type="password")
-            confirm_password = st.text_input(lang_manager.get_text("confirm_password", lang), type="password")
+            username = st.text_input(L["username"])
+            password = st.text_input(L["password"], type="password")
+            confirm_password = st.text_input(L["confirm_password"], type="password")
             
-            submitted = st.form_submit_button(lang_manager.get_text("register_button", lang), width='stretch')
+            submitted = st.form_submit_button(L["register_button"], width='stretch')
             
             if submitted:
                 if username and password and confirm_password:
@@ -280,19 +450,29 @@ if not st.session_state.authenticated:
 # Main app (only shown when authenticated)
 # Initialize user-specific database
 if 'db' not in st.session_state:
-    user_db_path = user_manager.get_user_database(st.session_state.username)
-    st.session_state.db = DatabaseManager(user_db_path)
+    st.session_state.db = get_db(st.session_state.username)
 
 if 'trades_df' not in st.session_state:
-    st.session_state.trades_df = st.session_state.db.get_trades()
+    reload_trades()
 
 # Main header
-st.markdown(f'<h1 class="main-header">📈 {lang_manager.get_text("title", lang)}</h1>', unsafe_allow_html=True)
+st.markdown(f'<h1 class="main-header">📈 {L["title"]}</h1>', unsafe_allow_html=True)
 st.markdown(f'<p class="sub-header">Welcome, {st.session_state.username}! | 歡迎, {st.session_state.username}!</p>', unsafe_allow_html=True)
 
+@st.fragment
+def sidebar_info_fragment(trades_df, trades_key):
+    """Sidebar database summary, rendered as its own fragment"""
+    st.markdown("### 📊 Database Info / 數據庫信息")
+    st.info(f"Total Trades / 總交易數: {len(trades_df)}")
+    
+    if not trades_df.empty:
+        summary = dashboard_metrics(trades_key, trades_df)
+        st.metric("Total P&L / 總盈虧", f"${summary['total_pnl']:.2f}")
+
 # Sidebar
 with st.sidebar:
-    st.image("https://via.placeholder.com/200x100/2E86AB/FFFFFF?text=TradeForge", width=200)
+    # Bundled logo, so the sidebar never waits on a network fetch
+    st.image(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "logo.svg"), width=200)
     
     # User info
     st.markdown(f"### 👤 {st.session_state.username}")
@@ -303,56 +483,58 @@ with st.sidebar:
         st.session_state.username = None
         st.session_state.db = None
         st.session_state.trades_df = None
+        st.session_state.trades_key = None
         st.rerun()
     
     st.markdown("---")
     
     st.markdown("### 🚀 Quick Actions")
     
+    # Everything that displays trades renders below this point, so reloading
+    # through the cached loader is enough; no extra st.rerun() is needed
     if st.button("🔄 Refresh Data / 刷新數據", width='stretch'):
-        st.session_state.trades_df = st.session_state.db.get_trades()
-        st.rerun()
+        st.session_state.db.invalidate_cache()
+        load_trades.clear()
+        reload_trades()
     
     if st.button("📊 Add Sample Data / 添加示例數據", width='stretch'):
-        create_sample_data()
-        st.session_state.trades_df = st.session_state.db.get_trades()
+        create_sample_data(st.session_state.db)
+        reload_trades()
         st.success("Sample data added! / 示例數據已添加！")
-        st.rerun()
     
     if st.button("🗑️ Reset Database / 重置數據庫", width='stretch'):
         if st.session_state.db.reset_database():
-            st.session_state.trades_df = st.session_state.db.get_trades()
+            reload_trades()
             st.success("Database reset successfully! / 數據庫重置成功！")
-            st.rerun()
         else:
             st.error("Failed to reset database / 重置數據庫失敗")
     
     st.markdown("---")
     
     # Database info
-    st.markdown("### 📊 Database Info / 數據庫信息")
-    st.info(f"Total Trades / 總交易數: {len(st.session_state.trades_df)}")
-    
-    if not st.session_state.trades_df.empty:
-        total_pnl = st.session_state.trades_df['realized_pnl'].sum() + st.session_state.trades_df['unrealized_pnl'].sum()
-        st.metric("Total P&L / 總盈虧", f"${total_pnl:.2f}")
+    sidebar_info_fragment(st.session_state.trades_df, st.session_state.trades_key)
+
+# Sidebar actions above may have changed the data, so the gate is taken here, once per rerun
+HAS_DATA = not st.session_state.trades_df.empty
 
 # Main content tabs
 tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-    f"🏠 {lang_manager.get_text('dashboard', lang)}", 
-    f"📝 {lang_manager.get_text('trade_entry', lang)}", 
-    f"📊 {lang_manager.get_text('analysis', lang)}", 
-    f"📈 {lang_manager.get_text('charts', lang)}", 
-    f"📅 {lang_manager.get_text('calendar', lang)}", 
-    f"💾 {lang_manager.get_text('data', lang)}", 
-    f"ℹ️ {lang_manager.get_text('about', lang)}"
+    f"🏠 {L['dashboard']}", 
+    f"📝 {L['trade_entry']}", 
+    f"📊 {L['analysis']}", 
+    f"📈 {L['charts']}", 
+    f"📅 {L['calendar']}", 
+    f"💾 {L['data']}", 
+    f"ℹ️ {L['about']}"
 ])
 
 # Tab 1: Dashboard
-with tab1:
+@st.fragment
+def dashboard_fragment(trades_df, trades_key):
+    """Dashboard body; runs as a fragment so it is isolated from the rest of the script"""
     st.header("🏠 Trading Dashboard")
     
-    if st.session_state.trades_df.empty:
+    if trades_df.empty:
         # Welcome screen for new users
         st.markdown("""
         <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; color: white; margin: 2rem 0;">
@@ -373,41 +555,43 @@ with tab1:
         # Dashboard with key metrics
         st.markdown("### 📊 Quick Overview")
         
+        summary = dashboard_metrics(trades_key, trades_df)
+        
         # Key metrics in a nice layout
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_trades = len(st.session_state.trades_df)
-            st.metric("Total Trades", total_trades)
+            st.metric("Total Trades", summary['total_trades'])
         
         with col2:
-            total_pnl = st.session_state.trades_df['realized_pnl'].sum() + st.session_state.trades_df['unrealized_pnl'].sum()
-            st.metric("Total P&L", f"${total_pnl:.2f}")
+            st.metric("Total P&L", f"${summary['total_pnl']:.2f}")
         
         with col3:
-            realized_trades = st.session_state.trades_df[st.session_state.trades_df['realized_pnl'] != 0]
-            if not realized_trades.empty:
-                win_rate = len(realized_trades[realized_trades['realized_pnl'] > 0]) / len(realized_trades) * 100
-                st.metric("Win Rate", f"{win_rate:.1f}%")
+            if summary['win_rate'] is not None:
+                st.metric("Win Rate", f"{summary['win_rate']:.1f}%")
             else:
                 st.metric("Win Rate", "N/A")
         
         with col4:
-            unique_tickers = st.session_state.trades_df['ticker'].nunique()
-            st.metric("Tickers", unique_tickers)
+            st.metric("Tickers", summary['unique_tickers'])
         
         # Recent trades preview
         st.markdown("### 📋 Recent Trades")
-        recent_trades = st.session_state.trades_df.head(5)
+        recent_trades = trades_df.head(5)
         
         if not recent_trades.empty:
-            # Create a cleaner display
-            display_df = recent_trades[['date', 'ticker', 'asset_type', 'trade_type', 'price', 'quantity', 'total_cost']].copy()
-            display_df['date'] = display_df['date'].dt.strftime('%m/%d %H:%M')
-            display_df['price'] = display_df['price'].apply(lambda x: f"${x:.2f}")
-            display_df['total_cost'] = display_df['total_cost'].apply(lambda x: f"${x:.2f}")
+            # Create a cleaner display; formatting is done client-side by column_config
+            display_df = recent_trades[['date', 'ticker', 'asset_type', 'trade_type', 'price', 'quantity', 'total_cost']]
             
-            st.dataframe(display_df, width='stretch')
+            st.dataframe(
+                display_df,
+                width='stretch',
+                column_config={
+                    'date': st.column_config.DatetimeColumn(format="MM/DD HH:mm"),
+                    'price': st.column_config.NumberColumn(format="$%.2f"),
+                    'total_cost': st.column_config.NumberColumn(format="$%.2f")
+                }
+            )
         else:
             st.info("No trades found. Add your first trade in the 'Add Trade' tab!")
         
@@ -424,8 +608,13 @@ with tab1:
         with col3:
             st.info("📈 **Create Charts**\n\nVisit the 'Charts' tab for visualizations.")
 
+with tab1:
+    dashboard_fragment(st.session_state.trades_df, st.session_state.trades_key)
+
 # Tab 2: Trade Entry
-with tab2:
+@st.fragment
+def trade_entry_fragment():
+    """Trade entry forms"""
     st.header("📝 Trade Entry")
     
     # Asset type selection
@@ -488,7 +677,7 @@ with tab2:
                         }
                         
                         trade_id = st.session_state.db.add_trade(trade_data)
-                        st.session_state.trades_df = st.session_state.db.get_trades()
+                        reload_trades()
                         
                         st.success(f"✅ Stock Trade #{trade_id} added successfully!")
                         st.rerun()
@@ -564,7 +753,7 @@ with tab2:
                         }
                         
                         trade_id = st.session_state.db.add_trade(trade_data)
-                        st.session_state.trades_df = st.session_state.db.get_trades()
+                        reload_trades()
                         
                         st.success(f"✅ Options Trade #{trade_id} added successfully!")
                         st.rerun()
@@ -623,7 +812,7 @@ with tab2:
                         }
                         
                         trade_id = st.session_state.db.add_trade(trade_data)
-                        st.session_state.trades_df = st.session_state.db.get_trades()
+                        reload_trades()
                         
                         st.success(f"✅ Crypto Trade #{trade_id} added successfully!")
                         st.rerun()
@@ -677,7 +866,7 @@ with tab2:
                         }
                         
                         trade_id = st.session_state.db.add_trade(trade_data)
-                        st.session_state.trades_df = st.session_state.db.get_trades()
+                        reload_trades()
                         
                         st.success(f"✅ {asset_type} Trade #{trade_id} added successfully!")
                         st.rerun()
@@ -686,15 +875,22 @@ with tab2:
                 else:
                     st.error("❌ Please fill in all required fields")
 
+with tab2:
+    trade_entry_fragment()
+
 # Tab 3: Analysis
-with tab3:
+@st.fragment
+def analysis_fragment():
+    """Analysis tab; its filter widgets rerun only this fragment"""
+    from utils import TradingCalculator
+    
     st.header("📊 Trading Analysis")
     
-    if st.session_state.trades_df.empty:
+    if not HAS_DATA:
         st.warning("No trades found. Add some trades to see analysis.")
     else:
         # Calculate metrics
-        metrics = TradingCalculator.calculate_metrics(st.session_state.trades_df)
+        metrics = TradingCalculator.cached_metrics(st.session_state.trades_df)
         
         # Key metrics row
         col1, col2, col3, col4 = st.columns(4)
@@ -762,84 +958,67 @@ with tab3:
         st.subheader("📋 Detailed Trade Analysis")
         
         # Filters
+        tickers, asset_types, first_date, last_date = filter_options(
+            st.session_state.trades_key, st.session_state.trades_df
+        )
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            ticker_filter = st.selectbox("Filter by Ticker", ["All"] + list(st.session_state.trades_df['ticker'].unique()))
+            ticker_filter = st.selectbox("Filter by Ticker", ["All"] + tickers)
         
         with col2:
-            asset_filter = st.selectbox("Filter by Asset Type", ["All"] + list(st.session_state.trades_df['asset_type'].unique()))
+            asset_filter = st.selectbox("Filter by Asset Type", ["All"] + asset_types)
         
         with col3:
-            date_range = st.date_input("Date Range", value=[st.session_state.trades_df['date'].min().date(), st.session_state.trades_df['date'].max().date()])
+            date_range = st.date_input("Date Range", value=[first_date, last_date])
         
-        # Apply filters
-        filtered_df = st.session_state.trades_df.copy()
+        # Apply filters as one query expression (evaluated by numexpr when it is installed)
+        conditions = []
         
         if ticker_filter != "All":
-            filtered_df = filtered_df[filtered_df['ticker'] == ticker_filter]
+            conditions.append("ticker == @ticker_filter")
         
         if asset_filter != "All":
-            filtered_df = filtered_df[filtered_df['asset_type'] == asset_filter]
+            conditions.append("asset_type == @asset_filter")
         
         if len(date_range) == 2:
             start_date, end_date = date_range
-            filtered_df = filtered_df[
-                (filtered_df['date'].dt.date >= start_date) & 
-                (filtered_df['date'].dt.date <= end_date)
-            ]
+            # Compare int64 nanoseconds; the end bound is exclusive midnight after end_date
+            date_ns = st.session_state.trades_df['date'].to_numpy(dtype='datetime64[ns]').view('i8')
+            start_ns = np.datetime64(start_date, 'D').astype('datetime64[ns]').astype('i8')
+            end_ns = (np.datetime64(end_date, 'D') + 1).astype('datetime64[ns]').astype('i8')
+            conditions.append("@start_ns <= @date_ns < @end_ns")
+        
+        if conditions:
+            filtered_df = st.session_state.trades_df.query(" and ".join(conditions))
+        else:
+            filtered_df = st.session_state.trades_df
         
         # Display filtered results
         if not filtered_df.empty:
-            st.dataframe(filtered_df, width='stretch')
+            paged_dataframe(filtered_df, 'analysis_page', width='stretch')
         else:
             st.warning("No trades match the selected filters.")
 
+with tab3:
+    analysis_fragment()
+
 # Tab 4: Charts
-with tab4:
+@st.fragment
+def charts_fragment():
+    """Charts tab; switching chart type reruns only this fragment"""
+    from charts import CHART_BUILDERS, ChartExporter
+    
     st.header("📈 Trading Charts & Visualizations")
     
-    if st.session_state.trades_df.empty:
+    if not HAS_DATA:
         st.warning("No trades found. Add some trades to see charts.")
     else:
         # Chart selection
-        chart_type = st.selectbox(
-            "Select Chart Type",
-            [
-                "Equity Curve",
-                "Win/Loss Distribution", 
-                "Monthly Returns",
-                "Drawdown Chart",
-                "Ticker Performance",
-                "Asset Type Performance",
-                "Trade Size Distribution",
-                "Metrics Dashboard",
-                "Correlation Heatmap",
-                "Time Series Analysis"
-            ]
-        )
+        chart_type = st.selectbox("Select Chart Type", list(CHART_BUILDERS))
         
-        # Generate selected chart
-        if chart_type == "Equity Curve":
-            fig = ChartGenerator.create_equity_curve(st.session_state.trades_df)
-        elif chart_type == "Win/Loss Distribution":
-            fig = ChartGenerator.create_win_loss_chart(st.session_state.trades_df)
-        elif chart_type == "Monthly Returns":
-            fig = ChartGenerator.create_monthly_returns_chart(st.session_state.trades_df)
-        elif chart_type == "Drawdown Chart":
-            fig = ChartGenerator.create_drawdown_chart(st.session_state.trades_df)
-        elif chart_type == "Ticker Performance":
-            fig = ChartGenerator.create_ticker_performance_chart(st.session_state.trades_df)
-        elif chart_type == "Asset Type Performance":
-            fig = ChartGenerator.create_asset_type_chart(st.session_state.trades_df)
-        elif chart_type == "Trade Size Distribution":
-            fig = ChartGenerator.create_trade_size_distribution(st.session_state.trades_df)
-        elif chart_type == "Metrics Dashboard":
-            fig = ChartGenerator.create_metrics_dashboard(st.session_state.trades_df)
-        elif chart_type == "Correlation Heatmap":
-            fig = ChartGenerator.create_correlation_heatmap(st.session_state.trades_df)
-        elif chart_type == "Time Series Analysis":
-            fig = ChartGenerator.create_time_series_analysis(st.session_state.trades_df)
+        # Generate selected chart (cached per chart type and data change)
+        fig = build_chart(chart_type, st.session_state.trades_key, st.session_state.trades_df)
         
         # Display chart
         st.plotly_chart(fig, width='stretch')
@@ -852,51 +1031,53 @@ with tab4:
         
         with col1:
             if st.button("📷 Export as PNG", width='stretch'):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tmp_file:
-                    if ChartExporter.export_chart_as_png(fig, tmp_file.name):
-                        with open(tmp_file.name, "rb") as file:
-                            st.download_button(
-                                label="Download PNG",
-                                data=file.read(),
-                                file_name=f"{chart_type.lower().replace(' ', '_')}.png",
-                                mime="image/png"
-                            )
-                    else:
-                        st.error("Failed to export PNG")
+                png_bytes = ChartExporter.chart_to_png_bytes(fig)
+                if png_bytes is not None:
+                    st.download_button(
+                        label="Download PNG",
+                        data=png_bytes,
+                        file_name=f"{chart_type.lower().replace(' ', '_')}.png",
+                        mime="image/png"
+                    )
+                else:
+                    st.error("Failed to export PNG")
         
         with col2:
             if st.button("📄 Export as PDF", width='stretch'):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-                    if ChartExporter.export_chart_as_pdf(fig, tmp_file.name):
-                        with open(tmp_file.name, "rb") as file:
-                            st.download_button(
-                                label="Download PDF",
-                                data=file.read(),
-                                file_name=f"{chart_type.lower().replace(' ', '_')}.pdf",
-                                mime="application/pdf"
-                            )
-                    else:
-                        st.error("Failed to export PDF")
+                pdf_bytes = ChartExporter.chart_to_pdf_bytes(fig)
+                if pdf_bytes is not None:
+                    st.download_button(
+                        label="Download PDF",
+                        data=pdf_bytes,
+                        file_name=f"{chart_type.lower().replace(' ', '_')}.pdf",
+                        mime="application/pdf"
+                    )
+                else:
+                    st.error("Failed to export PDF")
         
         with col3:
             if st.button("🌐 Export as HTML", width='stretch'):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmp_file:
-                    if ChartExporter.export_chart_as_html(fig, tmp_file.name):
-                        with open(tmp_file.name, "rb") as file:
-                            st.download_button(
-                                label="Download HTML",
-                                data=file.read(),
-                                file_name=f"{chart_type.lower().replace(' ', '_')}.html",
-                                mime="text/html"
-                            )
-                    else:
-                        st.error("Failed to export HTML")
+                html_bytes = ChartExporter.chart_to_html_bytes(fig)
+                if html_bytes is not None:
+                    st.download_button(
+                        label="Download HTML",
+                        data=html_bytes,
+                        file_name=f"{chart_type.lower().replace(' ', '_')}.html",
+                        mime="text/html"
+                    )
+                else:
+                    st.error("Failed to export HTML")
+
+with tab4:
+    charts_fragment()
 
 # Tab 5: Calendar
-with tab5:
+@st.fragment
+def calendar_fragment():
+    """Calendar tab; period selectors rerun only this fragment"""
     st.header("📅 Trading Calendar")
     
-    if st.session_state.trades_df.empty:
+    if not HAS_DATA:
         st.warning("No trades found. Add some trades to see the calendar view.")
     else:
         # Calendar view options
@@ -906,63 +1087,71 @@ with tab5:
             view_type = st.selectbox("📊 View Type", ["Monthly", "Weekly", "Daily"])
         
         with col2:
-            year = st.selectbox("📅 Year", range(2020, 2030), index=len(range(2020, 2030))-1)
+            year = st.selectbox("📅 Year", CALENDAR_YEARS, index=len(CALENDAR_YEARS)-1)
         
         with col3:
             if view_type == "Monthly":
-                month = st.selectbox("📆 Month", range(1, 13), index=datetime.now().month-1)
+                month = st.selectbox("📆 Month", CALENDAR_MONTHS, index=datetime.now().month-1)
             else:
                 month = None
         
-        # Calculate daily P&L
-        trades_df = st.session_state.trades_df.copy()
-        trades_df['date_only'] = trades_df['date'].dt.date
-        
-        # Group by date and calculate daily P&L
-        daily_pnl = trades_df.groupby('date_only').agg({
-            'realized_pnl': 'sum',
-            'unrealized_pnl': 'sum',
-            'total_cost': 'sum',
-            'ticker': 'count'
-        }).reset_index()
-        
-        daily_pnl['total_pnl'] = daily_pnl['realized_pnl'] + daily_pnl['unrealized_pnl']
-        
-        # Rename columns and ensure Date is datetime
-        daily_pnl = daily_pnl.rename(columns={
-            'date_only': 'Date',
-            'realized_pnl': 'Realized P&L',
-            'unrealized_pnl': 'Unrealized P&L',
-            'total_cost': 'Total Cost',
-            'ticker': 'Trade Count',
-            'total_pnl': 'Total P&L'
-        })
-        
-        # Ensure Date column is datetime
-        daily_pnl['Date'] = pd.to_datetime(daily_pnl['Date'])
-        
-        # Filter by selected period
+        # Locate the selected period in the day-sorted index instead of grouping every trade
+        trades_df = st.session_state.trades_df
+        sorted_days, order = calendar_index(st.session_state.trades_key, trades_df)
+        
         if view_type == "Monthly" and month:
-            daily_pnl = daily_pnl[
-                (daily_pnl['Date'].dt.year == year) & 
-                (daily_pnl['Date'].dt.month == month)
-            ]
+            period = np.datetime64(f"{year}-{month:02d}", 'M')
         elif view_type == "Yearly":
-            daily_pnl = daily_pnl[daily_pnl['Date'].dt.year == year]
+            period = np.datetime64(str(year), 'Y')
+        else:
+            period = None
+        
+        # Period bounds as day values, located in one vectorized search
+        if period is not None:
+            lo, hi = np.searchsorted(sorted_days, np.array([period, period + 1]).astype('datetime64[D]'))
+        else:
+            lo, hi = 0, len(order)
+        
+        rows, days = order[lo:hi], sorted_days[lo:hi]
+        
+        # Daily sums over just those rows; each day is a contiguous run in the slice
+        if len(rows):
+            starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+            
+            def day_sums(column):
+                return np.add.reduceat(np.nan_to_num(trades_df[column].to_numpy(dtype=float)[rows]), starts)
+            
+            realized = day_sums('realized_pnl')
+            unrealized = day_sums('unrealized_pnl')
+            daily_pnl = pd.DataFrame({
+                'Date': pd.to_datetime(days[starts]),
+                'Realized P&L': realized,
+                'Unrealized P&L': unrealized,
+                'Total Cost': day_sums('total_cost'),
+                # Category codes are a view; -1 marks a missing ticker, which count() would skip
+                'Trade Count': np.add.reduceat((trades_df['ticker'].cat.codes.to_numpy()[rows] >= 0).astype(np.int64), starts),
+                'Total P&L': realized + unrealized
+            })
+        else:
+            daily_pnl = pd.DataFrame()
         
         if not daily_pnl.empty:
             # Display calendar-style view
             st.markdown("### 📊 Daily P&L Summary")
             
-            # Create a calendar-like display
-            display_pnl = daily_pnl.copy()
-            display_pnl['Date'] = display_pnl['Date'].dt.strftime('%Y-%m-%d')
-            display_pnl['Realized P&L'] = display_pnl['Realized P&L'].apply(lambda x: f"${x:.2f}")
-            display_pnl['Unrealized P&L'] = display_pnl['Unrealized P&L'].apply(lambda x: f"${x:.2f}")
-            display_pnl['Total P&L'] = display_pnl['Total P&L'].apply(lambda x: f"${x:.2f}")
-            display_pnl['Total Cost'] = display_pnl['Total Cost'].apply(lambda x: f"${x:.2f}")
-            
-            st.dataframe(display_pnl, width='stretch')
+            # Create a calendar-like display; formatting is done client-side by column_config
+            paged_dataframe(
+                daily_pnl,
+                'calendar_page',
+                width='stretch',
+                column_config={
+                    'Date': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                    'Realized P&L': st.column_config.NumberColumn(format="$%.2f"),
+                    'Unrealized P&L': st.column_config.NumberColumn(format="$%.2f"),
+                    'Total P&L': st.column_config.NumberColumn(format="$%.2f"),
+                    'Total Cost': st.column_config.NumberColumn(format="$%.2f")
+                }
+            )
             
             # Summary statistics
             st.markdown("### 📈 Period Summary")
@@ -987,22 +1176,21 @@ with tab5:
             # Best and worst days
             st.markdown("### 🏆 Best & Worst Days")
             col1, col2 = st.columns(2)
+            day_totals = daily_pnl['Total P&L'].to_numpy()
             
             with col1:
-                best_day = daily_pnl.loc[daily_pnl['Total P&L'].idxmax()]
+                best_day = daily_pnl.iloc[int(day_totals.argmax())]
                 st.success(f"**Best Day:** {best_day['Date'].strftime('%Y-%m-%d')} - ${best_day['Total P&L']:.2f}")
             
             with col2:
-                worst_day = daily_pnl.loc[daily_pnl['Total P&L'].idxmin()]
+                worst_day = daily_pnl.iloc[int(day_totals.argmin())]
                 st.error(f"**Worst Day:** {worst_day['Date'].strftime('%Y-%m-%d')} - ${worst_day['Total P&L']:.2f}")
             
             # Create a simple calendar heatmap
             st.markdown("### 📅 P&L Heatmap")
             
-            # Create a simple heatmap using st.bar_chart
-            chart_data = daily_pnl.set_index('Date')['Total P&L']
-            
-            st.bar_chart(chart_data)
+            fig = calendar_heatmap(daily_pnl)
+            st.plotly_chart(fig, width='stretch')
             
         else:
             st.info(f"No trades found for the selected {view_type.lower()} period.")
@@ -1013,23 +1201,35 @@ with tab5:
         
         recent_trades = st.session_state.trades_df.head(10)
         if not recent_trades.empty:
-            display_df = recent_trades[['date', 'ticker', 'asset_type', 'trade_type', 'price', 'quantity', 'total_cost', 'realized_pnl']].copy()
-            display_df['date'] = display_df['date'].dt.strftime('%Y-%m-%d %H:%M')
-            display_df['price'] = display_df['price'].apply(lambda x: f"${x:.2f}")
-            display_df['total_cost'] = display_df['total_cost'].apply(lambda x: f"${x:.2f}")
-            display_df['realized_pnl'] = display_df['realized_pnl'].apply(lambda x: f"${x:.2f}")
+            display_df = recent_trades[['date', 'ticker', 'asset_type', 'trade_type', 'price', 'quantity', 'total_cost', 'realized_pnl']]
             
-            st.dataframe(display_df, width='stretch')
+            st.dataframe(
+                display_df,
+                width='stretch',
+                column_config={
+                    'date': st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm"),
+                    'price': st.column_config.NumberColumn(format="$%.2f"),
+                    'total_cost': st.column_config.NumberColumn(format="$%.2f"),
+                    'realized_pnl': st.column_config.NumberColumn(format="$%.2f")
+                }
+            )
+
+with tab5:
+    calendar_fragment()
 
 # Tab 6: Data Management (moved AI Insights here)
-with tab6:
+@st.fragment
+def data_fragment():
+    """AI insights and data management tab"""
+    from utils import DataExporter
+    
     st.header("🤖 AI Trading Insights")
     
-    if st.session_state.trades_df.empty:
+    if not HAS_DATA:
         st.warning("No trades found. Add some trades to get AI insights.")
     else:
-        # Generate insights
-        insights = AIInsights.generate_insights(st.session_state.trades_df)
+        # Generate insights (cached per data change, so button clicks below don't redo the analysis)
+        insights, ticker_pnl = trade_insights(st.session_state.trades_key, st.session_state.trades_df)
         
         # Display insights
         for i, insight in enumerate(insights, 1):
@@ -1040,28 +1240,26 @@ with tab6:
         st.subheader("📊 Pattern Analysis")
         
         # Best performing ticker
-        if not st.session_state.trades_df.empty:
-            ticker_pnl = st.session_state.trades_df.groupby('ticker')['realized_pnl'].sum().sort_values(ascending=False)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("🏆 Top Performers")
-                top_3 = ticker_pnl.head(3)
-                for ticker, pnl in top_3.items():
-                    if pnl > 0:
-                        st.success(f"{ticker}: ${pnl:.2f}")
-                    else:
-                        st.info(f"{ticker}: ${pnl:.2f}")
-            
-            with col2:
-                st.subheader("📉 Underperformers")
-                bottom_3 = ticker_pnl.tail(3)
-                for ticker, pnl in bottom_3.items():
-                    if pnl < 0:
-                        st.error(f"{ticker}: ${pnl:.2f}")
-                    else:
-                        st.info(f"{ticker}: ${pnl:.2f}")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("🏆 Top Performers")
+            top_3 = ticker_pnl.nlargest(3)
+            for ticker, pnl in top_3.items():
+                if pnl > 0:
+                    st.success(f"{ticker}: ${pnl:.2f}")
+                else:
+                    st.info(f"{ticker}: ${pnl:.2f}")
+        
+        with col2:
+            st.subheader("📉 Underperformers")
+            # Partial selection instead of a full sort; reversed so the worst is listed last as before
+            bottom_3 = ticker_pnl.nsmallest(3).iloc[::-1]
+            for ticker, pnl in bottom_3.items():
+                if pnl < 0:
+                    st.error(f"{ticker}: ${pnl:.2f}")
+                else:
+                    st.info(f"{ticker}: ${pnl:.2f}")
 
     st.markdown("---")
     st.subheader("💾 Data Management")
@@ -1073,20 +1271,23 @@ with tab6:
         
         # Export to CSV
         if st.button("📊 Export to CSV", width='stretch'):
-            if not st.session_state.trades_df.empty:
-                csv = st.session_state.trades_df.to_csv(index=False)
-                st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name=f"trades_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
+            if HAS_DATA:
+                csv_bytes = DataExporter.export_to_csv_bytes(st.session_state.trades_df)
+                if csv_bytes is not None:
+                    st.download_button(
+                        label="Download CSV",
+                        data=csv_bytes,
+                        file_name=f"trades_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                        mime="text/csv"
+                    )
+                else:
+                    st.error("Failed to export CSV file")
             else:
                 st.warning("No data to export")
         
         # Export to Excel
         if st.button("📈 Export to Excel", width='stretch'):
-            if not st.session_state.trades_df.empty:
+            if HAS_DATA:
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
                     if DataExporter.export_to_excel(st.session_state.trades_df, tmp_file.name):
                         with open(tmp_file.name, "rb") as file:
@@ -1101,8 +1302,25 @@ with tab6:
             else:
                 st.warning("No data to export")
         
+        # Export to Parquet
+        if st.button("🗜️ Export to Parquet", width='stretch'):
+            if HAS_DATA:
+                parquet_bytes = DataExporter.export_to_parquet_bytes(st.session_state.trades_df)
+                if parquet_bytes is not None:
+                    st.download_button(
+                        label="Download Parquet",
+                        data=parquet_bytes,
+                        file_name=f"trades_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet",
+                        mime="application/octet-stream"
+                    )
+                else:
+                    st.error("Failed to export Parquet file")
+            else:
+                st.warning("No data to export")
+        
         # Create backup
         if st.button("💾 Create Backup", width='stretch'):
+            st.session_state.db.checkpoint()
             with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp_file:
                 if DataExporter.create_backup_zip(st.session_state.db.db_path, tmp_file.name):
                     with open(tmp_file.name, "rb") as file:
@@ -1123,17 +1341,15 @@ with tab6:
         if uploaded_file is not None:
             if st.button("📊 Import CSV", width='stretch'):
                 try:
-                    # Save uploaded file temporarily
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp_file:
-                        tmp_file.write(uploaded_file.getvalue())
-                        tmp_file.flush()
-                        
-                        # Import data
-                        successful, failed = st.session_state.db.import_from_csv(tmp_file.name)
-                        st.session_state.trades_df = st.session_state.db.get_trades()
-                        
-                        st.success(f"Import completed! {successful} trades imported, {failed} failed.")
-                        st.rerun()
+                    import pyarrow.csv as pacsv
+                    
+                    # Parse the upload in memory with Arrow; no temp file round-trip
+                    table = pacsv.read_csv(BytesIO(uploaded_file.getvalue()))
+                    successful, failed = st.session_state.db.import_from_arrow_table(table)
+                    reload_trades()
+                    
+                    st.success(f"Import completed! {successful} trades imported, {failed} failed.")
+                    st.rerun()
                 except Exception as e:
                     st.error(f"Import failed: {str(e)}")
         
@@ -1149,7 +1365,10 @@ with tab6:
                         
                         # Restore data
                         if DataExporter.restore_from_zip(tmp_file.name):
-                            st.session_state.trades_df = st.session_state.db.get_trades()
+                            # The files were replaced behind the manager's back, so drop its cached frame too
+                            st.session_state.db.invalidate_cache()
+                            load_trades.clear()
+                            reload_trades()
                             st.success("Backup restored successfully!")
                             st.rerun()
                         else:
@@ -1161,7 +1380,7 @@ with tab6:
     st.markdown("---")
     st.subheader("📊 Database Statistics")
     
-    if not st.session_state.trades_df.empty:
+    if HAS_DATA:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
@@ -1180,13 +1399,19 @@ with tab6:
             try:
                 db_path = st.session_state.db.db_path
                 if os.path.exists(db_path):
-                    db_size = os.path.getsize(db_path) / 1024  # KB
+                    # Include pages still waiting in the write-ahead log
+                    wal_path = f"{db_path}-wal"
+                    wal_size = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+                    db_size = (os.path.getsize(db_path) + wal_size) / 1024  # KB
                     st.metric("Database Size", f"{db_size:.1f} KB")
                 else:
                     st.metric("Database Size", "0 KB")
             except:
                 st.metric("Database Size", "N/A")
 
+with tab6:
+    data_fragment()
+
 # Tab 7: About
 with tab7:
     st.header("ℹ️ About TradeForge")
@@ -4,38 +4,233 @@ Handles all Plotly visualizations and chart generation
 """
 
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from numba import njit
 from utils import TradingCalculator
 
+# Line charts with at least this many points are drawn with WebGL (Scattergl) instead of SVG
+WEBGL_POINT_THRESHOLD = 5000
+
+def _scatter_class(n_points: int, use_webgl: Optional[bool]):
+    """Scatter trace class for a line chart; use_webgl=None picks WebGL for large series"""
+    if use_webgl is None:
+        use_webgl = n_points >= WEBGL_POINT_THRESHOLD
+    return go.Scattergl if use_webgl else go.Scatter
+
+def _group_sum(keys, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-key sums via factorize + bincount, matching groupby().sum(): sorted keys, NaN keys and values skipped"""
+    codes, uniques = pd.factorize(keys, sort=True)
+    valid = codes >= 0
+    sums = np.bincount(codes[valid], weights=np.nan_to_num(values[valid]), minlength=len(uniques))
+    return np.asarray(uniques), sums
+
+@lru_cache(maxsize=4)
+def _empty_template(message: str) -> go.Figure:
+    """Placeholder figure with a centered message, built once per message and shared (do not mutate)"""
+    return go.Figure().add_annotation(
+        text=message,
+        xref="paper", yref="paper",
+        x=0.5, y=0.5, showarrow=False,
+        font=dict(size=16)
+    )
+
+def _empty_figure(message: str) -> go.Figure:
+    """Fresh copy of the cached placeholder, so callers may modify what the builders return"""
+    return go.Figure(_empty_template(message))
+
+@lru_cache(maxsize=1)
+def _dashboard_template() -> go.Figure:
+    """Metrics dashboard layout (subplot grid, titles, gauges), built once; values are filled in per call"""
+    # Create subplots
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Total P&L', 'Win Rate', 'Profit Factor', 'Max Drawdown'),
+        specs=[[{"type": "indicator"}, {"type": "indicator"}],
+               [{"type": "indicator"}, {"type": "indicator"}]]
+    )
+    
+    # Total P&L gauge
+    fig.add_trace(go.Indicator(
+        mode="number+delta",
+        value=0,
+        title={"text": "Total P&L ($)"},
+        domain={'x': [0, 0.5], 'y': [0.5, 1]}
+    ), row=1, col=1)
+    
+    # Win Rate gauge
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=0,
+        title={"text": "Win Rate (%)"},
+        gauge={'axis': {'range': [None, 100]},
+               'bar': {'color': "darkblue"},
+               'steps': [{'range': [0, 50], 'color': "lightgray"},
+                        {'range': [50, 80], 'color': "yellow"},
+                        {'range': [80, 100], 'color': "green"}]},
+        domain={'x': [0.5, 1], 'y': [0.5, 1]}
+    ), row=1, col=2)
+    
+    # Profit Factor gauge
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=0,
+        title={"text": "Profit Factor"},
+        gauge={'axis': {'range': [None, 5]},
+               'bar': {'color': "darkgreen"},
+               'steps': [{'range': [0, 1], 'color': "lightgray"},
+                        {'range': [1, 2], 'color': "yellow"},
+                        {'range': [2, 5], 'color': "green"}]},
+        domain={'x': [0, 0.5], 'y': [0, 0.5]}
+    ), row=2, col=1)
+    
+    # Max Drawdown gauge
+    fig.add_trace(go.Indicator(
+        mode="gauge+number",
+        value=0,
+        title={"text": "Max Drawdown ($)"},
+        gauge={'axis': {'range': [None, 1000]},
+               'bar': {'color': "darkred"},
+               'steps': [{'range': [0, 100], 'color': "green"},
+                        {'range': [100, 500], 'color': "yellow"},
+                        {'range': [500, 1000], 'color': "red"}]},
+        domain={'x': [0.5, 1], 'y': [0, 0.5]}
+    ), row=2, col=2)
+    
+    fig.update_layout(
+        title="Trading Metrics Dashboard",
+        template="plotly_white",
+        height=600
+    )
+    
+    return fig
+
+@njit(cache=True)
+def _cum_and_runmax(pnl: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Cumulative P&L and its running max in one pass.
+    
+    Same NaN handling as Series.cumsum/expanding().max(): NaN trades are skipped
+    but stay NaN in the cumulative curve, and the running max carries over them.
+    """
+    n = pnl.size
+    cumulative = np.empty(n)
+    running_max = np.empty(n)
+    total = 0.0
+    peak = np.nan
+    for i in range(n):
+        if pnl[i] != pnl[i]:
+            cumulative[i] = np.nan
+        else:
+            total += pnl[i]
+            cumulative[i] = total
+            if not total <= peak:
+                peak = total
+        running_max[i] = peak
+    return cumulative, running_max
+
+# Compile (or load the cached kernel) at import so the first chart render pays no JIT cost
+_cum_and_runmax(np.zeros(1))
+
+def _moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean via cumsum differences, same as rolling(window, min_periods=1).mean().
+    
+    NaNs are left out of each window's sum and count; a window with no values is NaN.
+    """
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, values.size + 1)
+    start = np.maximum(end - window, 0)
+    window_counts = counts[end] - counts[start]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(window_counts > 0, (sums[end] - sums[start]) / window_counts, np.nan)
+
+class EquityStats(NamedTuple):
+    """Date-ordered equity series shared by the equity, drawdown and time-series charts"""
+    dates: np.ndarray
+    cumulative: np.ndarray
+    running_max: np.ndarray
+    drawdown: np.ndarray
+    ma_5: np.ndarray
+    ma_20: np.ndarray
+
 class ChartGenerator:
     """Generates various trading charts and visualizations"""
     
+    # Per-DataFrame derived data (date-sorted view, metrics), keyed by id() and
+    # dropped when the source frame is garbage collected
+    _memo: Dict[int, Dict] = {}
+    
+    @staticmethod
+    def _memo_for(trades_df: pd.DataFrame) -> Dict:
+        """Memo entry for a trades frame, reset if its length changed"""
+        key = id(trades_df)
+        entry = ChartGenerator._memo.get(key)
+        if entry is None or entry['len'] != len(trades_df):
+            if entry is None:
+                weakref.finalize(trades_df, ChartGenerator._memo.pop, key, None)
+            entry = {'len': len(trades_df)}
+            ChartGenerator._memo[key] = entry
+        return entry
+    
+    @staticmethod
+    def _get_sorted(trades_df: pd.DataFrame) -> pd.DataFrame:
+        """Trades sorted by date (stable), computed once per frame"""
+        entry = ChartGenerator._memo_for(trades_df)
+        if 'sorted' not in entry:
+            entry['sorted'] = trades_df.sort_values('date', kind='mergesort')
+        return entry['sorted']
+    
+    @staticmethod
+    def _compute_equity_stats(trades_df: pd.DataFrame) -> EquityStats:
+        """Cumulative P&L, running max, drawdown and moving averages in one pass, once per frame"""
+        entry = ChartGenerator._memo_for(trades_df)
+        if 'equity' not in entry:
+            ordered = ChartGenerator._get_sorted(trades_df)
+            cumulative, running_max = _cum_and_runmax(ordered['realized_pnl'].to_numpy(dtype=np.float64))
+            
+            entry['equity'] = EquityStats(
+                dates=ordered['date'].to_numpy(),
+                cumulative=cumulative,
+                running_max=running_max,
+                drawdown=cumulative - running_max,
+                ma_5=_moving_average(cumulative, 5),
+                ma_20=_moving_average(cumulative, 20)
+            )
+        return entry['equity']
+    
+    @staticmethod
+    def _get_metrics(trades_df: pd.DataFrame) -> Dict:
+        """TradingCalculator metrics, computed once per frame"""
+        entry = ChartGenerator._memo_for(trades_df)
+        if 'metrics' not in entry:
+            entry['metrics'] = TradingCalculator.cached_metrics(trades_df)
+        return entry['metrics']
+    
     @staticmethod
-    def create_equity_curve(trades_df: pd.DataFrame) -> go.Figure:
+    def create_equity_curve(trades_df: pd.DataFrame, use_webgl: Optional[bool] = None) -> go.Figure:
         """Create equity curve chart"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
         
         # Calculate cumulative P&L
-        trades_df = trades_df.sort_values('date')
-        cumulative_pnl = trades_df['realized_pnl'].cumsum()
+        equity = ChartGenerator._compute_equity_stats(trades_df)
         
+        scatter = _scatter_class(len(trades_df), use_webgl)
         fig = go.Figure()
         
         # Add equity curve
-        fig.add_trace(go.Scatter(
-            x=trades_df['date'],
-            y=cumulative_pnl,
+        fig.add_trace(scatter(
+            x=equity.dates,
+            y=equity.cumulative,
             mode='lines+markers',
             name='Equity Curve',
             line=dict(color='#2E86AB', width=2),
@@ -60,34 +255,24 @@ class ChartGenerator:
     def create_win_loss_chart(trades_df: pd.DataFrame) -> go.Figure:
         """Create win/loss bar chart"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
         
-        # Filter realized trades only
-        realized_trades = trades_df[trades_df['realized_pnl'] != 0]
+        # Split realized trades with masks over the raw array (no filtered frames)
+        pnl = trades_df['realized_pnl'].to_numpy(dtype=np.float64)
         
-        if realized_trades.empty:
-            return go.Figure().add_annotation(
-                text="No realized trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+        if not (pnl != 0).any():
+            return _empty_figure("No realized trades to display")
         
         # Create win/loss data
-        wins = realized_trades[realized_trades['realized_pnl'] > 0]['realized_pnl']
-        losses = realized_trades[realized_trades['realized_pnl'] < 0]['realized_pnl']
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
         
         fig = go.Figure()
         
         # Add win bars
-        if not wins.empty:
+        if wins.size:
             fig.add_trace(go.Bar(
-                x=list(range(len(wins))),
+                x=np.arange(wins.size, dtype=np.int32),
                 y=wins,
                 name='Wins',
                 marker_color='#28a745',
@@ -95,9 +280,9 @@ class ChartGenerator:
             ))
         
         # Add loss bars
-        if not losses.empty:
+        if losses.size:
             fig.add_trace(go.Bar(
-                x=list(range(len(wins), len(wins) + len(losses))),
+                x=np.arange(wins.size, wins.size + losses.size, dtype=np.int32),
                 y=losses,
                 name='Losses',
                 marker_color='#dc3545',
@@ -119,25 +304,30 @@ class ChartGenerator:
     def create_monthly_returns_chart(trades_df: pd.DataFrame) -> go.Figure:
         """Create monthly returns chart"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
-        
-        # Group by month
-        trades_df['month'] = trades_df['date'].dt.to_period('M')
-        monthly_pnl = trades_df.groupby('month')['realized_pnl'].sum().reset_index()
-        monthly_pnl['month_str'] = monthly_pnl['month'].astype(str)
+            return _empty_figure("No trades to display")
+        
+        # Group by calendar month as int64 datetime64[M] keys (no Period objects)
+        months = trades_df['date'].to_numpy(dtype='datetime64[M]')
+        dated = ~np.isnat(months)
+        month_keys, monthly_pnl = _group_sum(
+            months[dated].view(np.int64),
+            trades_df['realized_pnl'].to_numpy(dtype=np.float64)[dated]
+        )
+        month_labels = np.datetime_as_string(month_keys.astype('datetime64[M]'))
         
-        # Create colors based on positive/negative
-        colors = ['#28a745' if x >= 0 else '#dc3545' for x in monthly_pnl['realized_pnl']]
+        # Create colors based on positive/negative; one scalar color when every month shares a sign
+        gains = monthly_pnl >= 0
+        if gains.all():
+            colors = '#28a745'
+        elif not gains.any():
+            colors = '#dc3545'
+        else:
+            colors = np.where(gains, '#28a745', '#dc3545')
         
         fig = go.Figure(data=[
             go.Bar(
-                x=monthly_pnl['month_str'],
-                y=monthly_pnl['realized_pnl'],
+                x=month_labels,
+                y=monthly_pnl,
                 marker_color=colors,
                 opacity=0.8
             )
@@ -154,28 +344,21 @@ class ChartGenerator:
         return fig
     
     @staticmethod
-    def create_drawdown_chart(trades_df: pd.DataFrame) -> go.Figure:
+    def create_drawdown_chart(trades_df: pd.DataFrame, use_webgl: Optional[bool] = None) -> go.Figure:
         """Create drawdown chart"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
         
         # Calculate drawdown
-        trades_df = trades_df.sort_values('date')
-        cumulative_pnl = trades_df['realized_pnl'].cumsum()
-        running_max = cumulative_pnl.expanding().max()
-        drawdown = cumulative_pnl - running_max
+        equity = ChartGenerator._compute_equity_stats(trades_df)
         
+        scatter = _scatter_class(len(trades_df), use_webgl)
         fig = go.Figure()
         
         # Add drawdown area
-        fig.add_trace(go.Scatter(
-            x=trades_df['date'],
-            y=drawdown,
+        fig.add_trace(scatter(
+            x=equity.dates,
+            y=equity.drawdown,
             fill='tozeroy',
             mode='lines',
             name='Drawdown',
@@ -200,31 +383,25 @@ class ChartGenerator:
     def create_ticker_performance_chart(trades_df: pd.DataFrame) -> go.Figure:
         """Create ticker performance chart"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
         
-        # Group by ticker
-        ticker_pnl = trades_df.groupby('ticker')['realized_pnl'].sum().sort_values(ascending=True)
+        # Nothing realized yet (open positions only): skip the grouping altogether
+        pnl = trades_df['realized_pnl'].to_numpy(dtype=np.float64)
+        if np.count_nonzero(pnl) == 0:
+            return _empty_figure("No realized trades to display")
         
-        if ticker_pnl.empty:
-            return go.Figure().add_annotation(
-                text="No realized trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+        # Group by ticker, then order by P&L ascending
+        tickers, ticker_pnl = _group_sum(trades_df['ticker'], pnl)
+        order = np.argsort(ticker_pnl, kind='stable')
+        tickers, ticker_pnl = tickers[order], ticker_pnl[order]
         
         # Create colors
-        colors = ['#28a745' if x >= 0 else '#dc3545' for x in ticker_pnl.values]
+        colors = np.where(ticker_pnl >= 0, '#28a745', '#dc3545')
         
         fig = go.Figure(data=[
             go.Bar(
-                x=ticker_pnl.values,
-                y=ticker_pnl.index,
+                x=ticker_pnl,
+                y=tickers,
                 orientation='h',
                 marker_color=colors,
                 opacity=0.8
@@ -245,28 +422,20 @@ class ChartGenerator:
     def create_asset_type_chart(trades_df: pd.DataFrame) -> go.Figure:
         """Create asset type performance pie chart"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
+        
+        # Nothing realized yet (open positions only): skip the grouping altogether
+        pnl = trades_df['realized_pnl'].to_numpy(dtype=np.float64)
+        if np.count_nonzero(pnl) == 0:
+            return _empty_figure("No realized trades to display")
         
         # Group by asset type
-        asset_pnl = trades_df.groupby('asset_type')['realized_pnl'].sum()
-        
-        if asset_pnl.empty:
-            return go.Figure().add_annotation(
-                text="No realized trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+        asset_types, asset_pnl = _group_sum(trades_df['asset_type'], pnl)
         
         fig = go.Figure(data=[
             go.Pie(
-                labels=asset_pnl.index,
-                values=asset_pnl.values,
+                labels=asset_types,
+                values=asset_pnl,
                 hole=0.3
             )
         ])
@@ -283,17 +452,19 @@ class ChartGenerator:
     def create_trade_size_distribution(trades_df: pd.DataFrame) -> go.Figure:
         """Create trade size distribution histogram"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
+        
+        # Bin server-side so the browser gets 20 bars rather than every trade
+        sizes = trades_df['total_cost'].to_numpy(dtype=np.float64)
+        counts, edges = np.histogram(sizes[~np.isnan(sizes)], bins=20)
         
         fig = go.Figure(data=[
-            go.Histogram(
-                x=trades_df['total_cost'],
-                nbinsx=20,
+            go.Bar(
+                x=(edges[:-1] + edges[1:]) * 0.5,
+                y=counts,
+                width=np.diff(edges),
+                customdata=np.column_stack((edges[:-1], edges[1:])),
+                hovertemplate="$%{customdata[0]:,.2f} - $%{customdata[1]:,.2f}<br>Trades: %{y}<extra></extra>",
                 marker_color='#2E86AB',
                 opacity=0.7
             )
@@ -304,7 +475,8 @@ class ChartGenerator:
             xaxis_title="Trade Size ($)",
             yaxis_title="Frequency",
             template="plotly_white",
-            height=400
+            height=400,
+            bargap=0
         )
         
         return fig
@@ -313,76 +485,17 @@ class ChartGenerator:
     def create_metrics_dashboard(trades_df: pd.DataFrame) -> go.Figure:
         """Create metrics dashboard with key statistics"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
         
         # Calculate metrics
-        metrics = TradingCalculator.calculate_metrics(trades_df)
-        
-        # Create subplots
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Total P&L', 'Win Rate', 'Profit Factor', 'Max Drawdown'),
-            specs=[[{"type": "indicator"}, {"type": "indicator"}],
-                   [{"type": "indicator"}, {"type": "indicator"}]]
-        )
-        
-        # Total P&L gauge
-        fig.add_trace(go.Indicator(
-            mode="number+delta",
-            value=metrics.get('total_pnl', 0),
-            title={"text": "Total P&L ($)"},
-            domain={'x': [0, 0.5], 'y': [0.5, 1]}
-        ), row=1, col=1)
-        
-        # Win Rate gauge
-        fig.add_trace(go.Indicator(
-            mode="gauge+number",
-            value=metrics.get('win_rate', 0),
-            title={"text": "Win Rate (%)"},
-            gauge={'axis': {'range': [None, 100]},
-                   'bar': {'color': "darkblue"},
-                   'steps': [{'range': [0, 50], 'color': "lightgray"},
-                            {'range': [50, 80], 'color': "yellow"},
-                            {'range': [80, 100], 'color': "green"}]},
-            domain={'x': [0.5, 1], 'y': [0.5, 1]}
-        ), row=1, col=2)
-        
-        # Profit Factor gauge
-        fig.add_trace(go.Indicator(
-            mode="gauge+number",
-            value=min(metrics.get('profit_factor', 0), 5),  # Cap at 5 for display
-            title={"text": "Profit Factor"},
-            gauge={'axis': {'range': [None, 5]},
-                   'bar': {'color': "darkgreen"},
-                   'steps': [{'range': [0, 1], 'color': "lightgray"},
-                            {'range': [1, 2], 'color': "yellow"},
-                            {'range': [2, 5], 'color': "green"}]},
-            domain={'x': [0, 0.5], 'y': [0, 0.5]}
-        ), row=2, col=1)
-        
-        # Max Drawdown gauge
-        fig.add_trace(go.Indicator(
-            mode="gauge+number",
-            value=abs(metrics.get('max_drawdown', 0)),
-            title={"text": "Max Drawdown ($)"},
-            gauge={'axis': {'range': [None, 1000]},
-                   'bar': {'color': "darkred"},
-                   'steps': [{'range': [0, 100], 'color': "green"},
-                            {'range': [100, 500], 'color': "yellow"},
-                            {'range': [500, 1000], 'color': "red"}]},
-            domain={'x': [0.5, 1], 'y': [0, 0.5]}
-        ), row=2, col=2)
+        metrics = ChartGenerator._get_metrics(trades_df)
         
-        fig.update_layout(
-            title="Trading Metrics Dashboard",
-            template="plotly_white",
-            height=600
-        )
+        # Copy the prebuilt layout and fill in the four indicator values
+        fig = go.Figure(_dashboard_template())
+        fig.data[0].value = metrics.get('total_pnl', 0)
+        fig.data[1].value = metrics.get('win_rate', 0)
+        fig.data[2].value = min(metrics.get('profit_factor', 0), 5)  # Cap at 5 for display
+        fig.data[3].value = abs(metrics.get('max_drawdown', 0))
         
         return fig
     
@@ -390,31 +503,28 @@ class ChartGenerator:
     def create_correlation_heatmap(trades_df: pd.DataFrame) -> go.Figure:
         """Create correlation heatmap of trading metrics"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("No trades to display")
         
         # Prepare data for correlation
         numeric_cols = ['price', 'quantity', 'fees', 'total_cost', 'realized_pnl']
         available_cols = [col for col in numeric_cols if col in trades_df.columns]
         
         if len(available_cols) < 2:
-            return go.Figure().add_annotation(
-                text="Insufficient data for correlation analysis",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
+            return _empty_figure("Insufficient data for correlation analysis")
         
-        corr_data = trades_df[available_cols].corr()
+        # One (n_trades, n_cols) block straight into np.corrcoef; pandas' pairwise
+        # .corr() is only needed when NaNs have to be dropped per column pair
+        values = trades_df[available_cols].to_numpy(dtype=np.float64)
+        if len(values) < 2 or np.isnan(values).any():
+            corr = trades_df[available_cols].corr().to_numpy()
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                corr = np.corrcoef(values, rowvar=False)
         
         fig = go.Figure(data=go.Heatmap(
-            z=corr_data.values,
-            x=corr_data.columns,
-            y=corr_data.columns,
+            z=corr,
+            x=available_cols,
+            y=available_cols,
             colorscale='RdBu',
             zmid=0
         ))
@@ -428,49 +538,38 @@ class ChartGenerator:
         return fig
     
     @staticmethod
-    def create_time_series_analysis(trades_df: pd.DataFrame) -> go.Figure:
+    def create_time_series_analysis(trades_df: pd.DataFrame, use_webgl: Optional[bool] = None) -> go.Figure:
         """Create time series analysis with moving averages"""
         if trades_df.empty:
-            return go.Figure().add_annotation(
-                text="No trades to display",
-                xref="paper", yref="paper",
-                x=0.5, y=0.5, showarrow=False,
-                font=dict(size=16)
-            )
-        
-        # Sort by date
-        trades_df = trades_df.sort_values('date')
+            return _empty_figure("No trades to display")
         
-        # Calculate cumulative P&L
-        cumulative_pnl = trades_df['realized_pnl'].cumsum()
-        
-        # Calculate moving averages
-        ma_5 = cumulative_pnl.rolling(window=5, min_periods=1).mean()
-        ma_20 = cumulative_pnl.rolling(window=20, min_periods=1).mean()
+        # Cumulative P&L and moving averages, shared with the equity and drawdown charts
+        equity = ChartGenerator._compute_equity_stats(trades_df)
         
+        scatter = _scatter_class(len(trades_df), use_webgl)
         fig = go.Figure()
         
         # Add cumulative P&L
-        fig.add_trace(go.Scatter(
-            x=trades_df['date'],
-            y=cumulative_pnl,
+        fig.add_trace(scatter(
+            x=equity.dates,
+            y=equity.cumulative,
             mode='lines',
             name='Cumulative P&L',
             line=dict(color='#2E86AB', width=2)
         ))
         
         # Add moving averages
-        fig.add_trace(go.Scatter(
-            x=trades_df['date'],
-            y=ma_5,
+        fig.add_trace(scatter(
+            x=equity.dates,
+            y=equity.ma_5,
             mode='lines',
             name='5-Trade MA',
             line=dict(color='orange', width=1, dash='dash')
         ))
         
-        fig.add_trace(go.Scatter(
-            x=trades_df['date'],
-            y=ma_20,
+        fig.add_trace(scatter(
+            x=equity.dates,
+            y=equity.ma_20,
             mode='lines',
             name='20-Trade MA',
             line=dict(color='red', width=1, dash='dot')
@@ -487,14 +586,96 @@ class ChartGenerator:
         
         return fig
 
+    @staticmethod
+    def create_pnl_calendar_heatmap(daily_pnl: pd.DataFrame) -> go.Figure:
+        """Create a weekday x week calendar heatmap from daily P&L ('Date', 'Total P&L')"""
+        if daily_pnl.empty:
+            return _empty_figure("No trades to display")
+        
+        # Lay days out on a Monday-aligned grid; 1970-01-01 (day 0) was a Thursday
+        days = daily_pnl['Date'].to_numpy(dtype='datetime64[D]')
+        first = days.min()
+        start = first - (first.astype(np.int64) + 3) % 7
+        offsets = (days - start).astype(np.int64)
+        n_cells = (offsets.max() // 7 + 1) * 7
+        
+        grid = np.full(n_cells, np.nan)
+        grid[offsets] = daily_pnl['Total P&L'].to_numpy(dtype=float)
+        week_starts = start + np.arange(0, n_cells, 7)
+        
+        fig = go.Figure(data=go.Heatmap(
+            z=grid.reshape(-1, 7).T,
+            x=np.datetime_as_string(week_starts),
+            y=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
+            colorscale='RdYlGn',
+            zmid=0,
+            hoverongaps=False,
+            hovertemplate="Week of %{x}, %{y}<br>P&L: $%{z:.2f}<extra></extra>"
+        ))
+        
+        fig.update_layout(
+            title="Daily P&L Calendar",
+            xaxis_title="Week Starting",
+            yaxis=dict(autorange="reversed"),
+            template="plotly_white",
+            height=350
+        )
+        
+        return fig
+
+# Chart names shown in the UI, in display order, mapped to their builders
+CHART_BUILDERS = {
+    "Equity Curve": ChartGenerator.create_equity_curve,
+    "Win/Loss Distribution": ChartGenerator.create_win_loss_chart,
+    "Monthly Returns": ChartGenerator.create_monthly_returns_chart,
+    "Drawdown Chart": ChartGenerator.create_drawdown_chart,
+    "Ticker Performance": ChartGenerator.create_ticker_performance_chart,
+    "Asset Type Performance": ChartGenerator.create_asset_type_chart,
+    "Trade Size Distribution": ChartGenerator.create_trade_size_distribution,
+    "Metrics Dashboard": ChartGenerator.create_metrics_dashboard,
+    "Correlation Heatmap": ChartGenerator.create_correlation_heatmap,
+    "Time Series Analysis": ChartGenerator.create_time_series_analysis
+}
+
+def get_cached_json(name: str, trades_df: pd.DataFrame) -> str:
+    """Plotly JSON for a chart, built and encoded once per trades frame.
+    
+    For callers that ship the figure spec themselves (e.g. a Dash callback
+    returning pre-serialized JSON); shares the per-frame memo, so it is
+    dropped together with the frame.
+    """
+    cached = ChartGenerator._memo_for(trades_df).setdefault('json', {})
+    if name not in cached:
+        cached[name] = pio.to_json(CHART_BUILDERS[name](trades_df), validate=False)
+    return cached[name]
+
+def render_all(trades_df: pd.DataFrame, chart_names: Optional[List[str]] = None,
+               max_workers: Optional[int] = None) -> Dict[str, go.Figure]:
+    """Build several charts concurrently, returned in the requested order.
+    
+    The shared per-frame data (sorted view, equity series, metrics) is computed
+    on the calling thread first, so the workers only build Plotly traces and
+    never write to ChartGenerator's memo at the same time.
+    """
+    if chart_names is None:
+        chart_names = list(CHART_BUILDERS)
+    
+    if not trades_df.empty:
+        ChartGenerator._compute_equity_stats(trades_df)
+        ChartGenerator._get_metrics(trades_df)
+    
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        futures = [pool.submit(CHART_BUILDERS[name], trades_df) for name in chart_names]
+        return {name: future.result() for name, future in zip(chart_names, futures)}
+
 class ChartExporter:
     """Handles chart export functionality"""
     
     @staticmethod
-    def export_chart_as_png(fig: go.Figure, filepath: str) -> bool:
+    def export_chart_as_png(fig: go.Figure, filepath: str, scale: float = 1) -> bool:
         """Export chart as PNG"""
         try:
-            fig.write_image(filepath, width=1200, height=800, scale=2)
+            fig.write_image(filepath, width=1200, height=800, scale=scale)
             return True
         except Exception as e:
             print(f"PNG export error: {e}")
@@ -519,6 +700,48 @@ class ChartExporter:
         except Exception as e:
             print(f"HTML export error: {e}")
             return False
+    
+    @staticmethod
+    def export_charts_as_png(figs: List[go.Figure], filepaths: List[str], scale: float = 1) -> bool:
+        """Export several charts as PNG through a single Kaleido session"""
+        try:
+            if hasattr(pio, 'write_images'):
+                pio.write_images(figs, filepaths, format="png", width=1200, height=800, scale=scale)
+            else:
+                # plotly < 6.1 has no batch export; render one figure at a time
+                for fig, filepath in zip(figs, filepaths):
+                    fig.write_image(filepath, format="png", width=1200, height=800, scale=scale)
+            return True
+        except Exception as e:
+            print(f"PNG export error: {e}")
+            return False
+    
+    @staticmethod
+    def chart_to_png_bytes(fig: go.Figure, scale: float = 1) -> Optional[bytes]:
+        """Render chart as PNG bytes in memory"""
+        try:
+            return fig.to_image(format="png", width=1200, height=800, scale=scale)
+        except Exception as e:
+            print(f"PNG export error: {e}")
+            return None
+    
+    @staticmethod
+    def chart_to_pdf_bytes(fig: go.Figure) -> Optional[bytes]:
+        """Render chart as PDF bytes in memory"""
+        try:
+            return fig.to_image(format="pdf", width=1200, height=800)
+        except Exception as e:
+            print(f"PDF export error: {e}")
+            return None
+    
+    @staticmethod
+    def chart_to_html_bytes(fig: go.Figure) -> Optional[bytes]:
+        """Render chart as standalone HTML bytes in memory"""
+        try:
+            return fig.to_html().encode("utf-8")
+        except Exception as e:
+            print(f"HTML export error: {e}")
+            return None
 
 if __name__ == "__main__":
     # Test chart generation
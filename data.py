@@ -4,23 +4,33 @@ Handles SQLite database operations, data models, and data management
 """
 
 import sqlite3
+from contextlib import closing
 import pandas as pd
+import numpy as np
 from datetime import datetime, date
 from typing import List, Dict, Optional, Tuple
 import os
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text
+import threading
+from sqlalchemy import create_engine, event, text, update, Index, Column, Integer, String, Float, DateTime, Boolean, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import json
 
 Base = declarative_base()
 
+# Low-cardinality text columns loaded as pandas categoricals
+CATEGORICAL_COLUMNS = ('ticker', 'asset_type', 'trade_type', 'currency', 'market', 'option_type', 'strategy')
+# Numeric columns deliberately stay float64: float32 loses cents once amounts pass ~$100k,
+# and quantity is a Float column where small downcast integer dtypes would overflow in arithmetic
+
 class Trade(Base):
     """Trade model for SQLite database"""
     __tablename__ = 'trades'
+    # date serves the newest-first ORDER BY; (ticker, date) serves per-ticker lookups in date order
+    __table_args__ = (Index('ix_trades_ticker_date', 'ticker', 'date'),)
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    date = Column(DateTime, nullable=False)
+    date = Column(DateTime, nullable=False, index=True)
     ticker = Column(String(20), nullable=False)
     asset_type = Column(String(20), nullable=False)  # Stock, Option
     trade_type = Column(String(10), nullable=False)  # Buy, Sell
@@ -45,6 +55,59 @@ class Trade(Base):
     currency = Column(String(3), default="USD")
     market = Column(String(10), default="US")  # US, HK
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply WAL journaling and related tuning to every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+# Shared INSERT construct, so every insert path reuses one compiled statement
+INSERT_TRADE = Trade.__table__.insert()
+
+# Summary statistics for get_trade_stats, including the max drawdown of the running
+# realized P&L (running sum, then its running max, via window functions)
+TRADE_STATS_SQL = """
+WITH running AS (
+    SELECT date, id,
+           SUM(realized_pnl) OVER (ORDER BY date DESC, id DESC
+                                   ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS cumulative
+    FROM trades
+), drawdowns AS (
+    SELECT cumulative - MAX(cumulative) OVER (ORDER BY date DESC, id DESC
+                                              ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) AS drawdown
+    FROM running
+)
+SELECT COUNT(*) AS total_trades,
+       COALESCE(SUM(realized_pnl), 0) + COALESCE(SUM(unrealized_pnl), 0) AS total_pnl,
+       COUNT(CASE WHEN realized_pnl > 0 THEN 1 END) AS wins,
+       AVG(CASE WHEN realized_pnl > 0 THEN realized_pnl END) AS avg_win,
+       AVG(CASE WHEN realized_pnl < 0 THEN realized_pnl END) AS avg_loss,
+       (SELECT MIN(drawdown) FROM drawdowns) AS max_drawdown
+FROM trades
+"""
+
+# Buffer dtype per trades column for _read_trades; DateTime columns arrive as ISO strings
+# and are collected as objects, then parsed in one vectorized pass
+TRADE_COLUMN_DTYPES = [(column.name, np.int64 if isinstance(column.type, Integer)
+                        else np.float64 if isinstance(column.type, Float) else object)
+                       for column in Trade.__table__.columns]
+DATETIME_COLUMNS = [column.name for column in Trade.__table__.columns if isinstance(column.type, DateTime)]
+COUNT_TRADES_SQL = "SELECT COUNT(*) FROM trades"
+READ_TRADES_SQL = (f"SELECT {', '.join(name for name, _ in TRADE_COLUMN_DTYPES)} "
+                   "FROM trades ORDER BY date DESC LIMIT ?")
+READ_TRADES_CHUNK = 10000
+
+def _is_blank(values: pd.Series) -> pd.Series:
+    """Missing, empty or whitespace-only cells of an imported column"""
+    blank = values.isna() | (values == '')
+    if pd.api.types.is_string_dtype(values):
+        blank |= values.str.strip().eq('')
+    return blank
+
 class DatabaseManager:
     """Manages SQLite database operations"""
     
@@ -57,47 +120,71 @@ class DatabaseManager:
             db_path = f"trades_{username}.db"
         self.db_path = db_path
         self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
+        event.listen(self.engine, "connect", _set_sqlite_pragmas)
         self.Session = sessionmaker(bind=self.engine)
+        # Bumped on every write so cached reads can be keyed on it
+        self.version = 0
+        # get_trades results per limit, as (version read at, frame)
+        self._trades_cache: Dict[Optional[int], Tuple[int, pd.DataFrame]] = {}
+        self._cache_lock = threading.Lock()
         self._create_tables()
     
     def _create_tables(self):
         """Create database tables if they don't exist"""
         Base.metadata.create_all(self.engine)
+        # create_all only indexes tables it creates; add missing indexes to existing databases too
+        for index in Trade.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+    
+    @staticmethod
+    def _trade_row(trade_data: Dict) -> Dict:
+        """Build the column values for a new trade, including calculated fields"""
+        # Calculate total cost
+        total_cost = (trade_data['price'] * trade_data['quantity']) + trade_data.get('fees', 0)
+        
+        # Determine currency and market
+        currency = "HKD" if trade_data['ticker'].endswith('.HK') else "USD"
+        market = "HK" if trade_data['ticker'].endswith('.HK') else "US"
+        
+        return {
+            'date': trade_data['date'],
+            'ticker': trade_data['ticker'],
+            'asset_type': trade_data['asset_type'],
+            'trade_type': trade_data['trade_type'],
+            'price': trade_data['price'],
+            'quantity': trade_data['quantity'],
+            'fees': trade_data.get('fees', 0),
+            'notes': trade_data.get('notes', ''),
+            'option_type': trade_data.get('option_type'),
+            'strike_price': trade_data.get('strike_price'),
+            'expiration_date': trade_data.get('expiration_date'),
+            'premium': trade_data.get('premium'),
+            'strategy': trade_data.get('strategy'),
+            'total_cost': total_cost,
+            'currency': currency,
+            'market': market
+        }
     
     def add_trade(self, trade_data: Dict) -> int:
         """Add a new trade to the database"""
+        # Plain Core INSERT: no ORM object, identity map or flush for a single row
+        with self.engine.begin() as conn:
+            trade_id = conn.execute(INSERT_TRADE, self._trade_row(trade_data)).inserted_primary_key[0]
+        self.version += 1
+        return trade_id
+    
+    def add_trades(self, trades: List[Dict]) -> int:
+        """Add many trades in a single transaction. Returns the number inserted"""
+        if not trades:
+            return 0
+        
+        rows = [self._trade_row(trade_data) for trade_data in trades]
         session = self.Session()
         try:
-            # Calculate total cost
-            total_cost = (trade_data['price'] * trade_data['quantity']) + trade_data.get('fees', 0)
-            
-            # Determine currency and market
-            currency = "HKD" if trade_data['ticker'].endswith('.HK') else "USD"
-            market = "HK" if trade_data['ticker'].endswith('.HK') else "US"
-            
-            trade = Trade(
-                date=trade_data['date'],
-                ticker=trade_data['ticker'],
-                asset_type=trade_data['asset_type'],
-                trade_type=trade_data['trade_type'],
-                price=trade_data['price'],
-                quantity=trade_data['quantity'],
-                fees=trade_data.get('fees', 0),
-                notes=trade_data.get('notes', ''),
-                option_type=trade_data.get('option_type'),
-                strike_price=trade_data.get('strike_price'),
-                expiration_date=trade_data.get('expiration_date'),
-                premium=trade_data.get('premium'),
-                strategy=trade_data.get('strategy'),
-                total_cost=total_cost,
-                currency=currency,
-                market=market
-            )
-            
-            session.add(trade)
+            session.execute(INSERT_TRADE, rows)
             session.commit()
-            trade_id = trade.id
-            return trade_id
+            self.version += 1
+            return len(rows)
         except Exception as e:
             session.rollback()
             raise e
@@ -106,64 +193,79 @@ class DatabaseManager:
     
     def get_trades(self, limit: Optional[int] = None) -> pd.DataFrame:
         """Get all trades as DataFrame"""
-        session = self.Session()
-        try:
-            query = session.query(Trade).order_by(Trade.date.desc())
-            if limit:
-                query = query.limit(limit)
-            
-            trades = query.all()
-            data = []
-            for trade in trades:
-                data.append({
-                    'id': trade.id,
-                    'date': trade.date,
-                    'ticker': trade.ticker,
-                    'asset_type': trade.asset_type,
-                    'trade_type': trade.trade_type,
-                    'price': trade.price,
-                    'quantity': trade.quantity,
-                    'fees': trade.fees,
-                    'notes': trade.notes,
-                    'option_type': trade.option_type,
-                    'strike_price': trade.strike_price,
-                    'expiration_date': trade.expiration_date,
-                    'premium': trade.premium,
-                    'strategy': trade.strategy,
-                    'total_cost': trade.total_cost,
-                    'realized_pnl': trade.realized_pnl,
-                    'unrealized_pnl': trade.unrealized_pnl,
-                    'currency': trade.currency,
-                    'market': trade.market
-                })
-            
-            return pd.DataFrame(data)
-        finally:
-            session.close()
+        # Served from memory until the next write through this manager bumps the version
+        key = limit or None
+        with self._cache_lock:
+            cached = self._trades_cache.get(key)
+        if cached is not None and cached[0] == self.version:
+            return cached[1].copy()
+        
+        version = self.version
+        df = self._read_trades(key)
+        with self._cache_lock:
+            self._trades_cache[key] = (version, df)
+        return df.copy()
+    
+    def _read_trades(self, limit: Optional[int]) -> pd.DataFrame:
+        """Query trades from the database, newest first"""
+        # Raw DBAPI rows, without SQLAlchemy result processing, written chunk by chunk
+        # into typed columns preallocated from the row count
+        with closing(self.engine.raw_connection()) as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")  # the count and the rows come from one snapshot
+            try:
+                n = cursor.execute(COUNT_TRADES_SQL).fetchone()[0]
+                if limit:
+                    n = min(n, limit)
+                if n == 0:
+                    return pd.DataFrame()
+                
+                columns = {name: np.empty(n, dtype=dtype) for name, dtype in TRADE_COLUMN_DTYPES}
+                cursor.execute(READ_TRADES_SQL, (limit or -1,))
+                start = 0
+                rows = cursor.fetchmany(READ_TRADES_CHUNK)
+                while rows:
+                    end = start + len(rows)
+                    for (name, _), values in zip(TRADE_COLUMN_DTYPES, zip(*rows)):
+                        columns[name][start:end] = values
+                    start = end
+                    rows = cursor.fetchmany(READ_TRADES_CHUNK)
+            finally:
+                conn.rollback()
+        
+        for col in DATETIME_COLUMNS:
+            columns[col] = pd.to_datetime(columns[col], format='ISO8601').as_unit('us')
+        df = pd.DataFrame(columns, copy=False)
+        for col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype('category')
+        return df
+    
+    def invalidate_cache(self):
+        """Drop cached trades, e.g. after the database file was changed outside this manager"""
+        with self._cache_lock:
+            self._trades_cache.clear()
     
     def update_trade(self, trade_id: int, trade_data: Dict) -> bool:
         """Update an existing trade"""
-        session = self.Session()
-        try:
-            trade = session.query(Trade).filter(Trade.id == trade_id).first()
-            if not trade:
-                return False
-            
-            # Update fields
-            for key, value in trade_data.items():
-                if hasattr(trade, key):
-                    setattr(trade, key, value)
-            
-            # Recalculate total cost
-            trade.total_cost = (trade.price * trade.quantity) + trade.fees
-            
-            session.commit()
-            return True
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        columns = Trade.__table__.c
+        # Only real columns; the id is fixed and total_cost is always derived
+        values = {key: value for key, value in trade_data.items()
+                  if key in columns and key not in ('id', 'total_cost')}
+        
+        # Recalculate total cost, using the stored value for anything not being changed
+        values['total_cost'] = (values.get('price', columns.price) * values.get('quantity', columns.quantity)
+                                + values.get('fees', columns.fees))
+        
+        # One UPDATE statement instead of loading the row and tracking attribute changes
+        with self.engine.begin() as conn:
+            updated = conn.execute(
+                update(Trade.__table__).where(columns.id == trade_id).values(**values)
+            ).rowcount
+        if not updated:
+            return False
+        
+        self.version += 1
+        return True
     
     def delete_trade(self, trade_id: int) -> bool:
         """Delete a trade"""
@@ -175,6 +277,7 @@ class DatabaseManager:
             
             session.delete(trade)
             session.commit()
+            self.version += 1
             return True
         except Exception as e:
             session.rollback()
@@ -182,12 +285,14 @@ class DatabaseManager:
         finally:
             session.close()
     
-    def reset_database(self):
+    def reset_database(self) -> bool:
         """Clear all trades from database"""
         session = self.Session()
         try:
             session.query(Trade).delete()
             session.commit()
+            self.version += 1
+            return True
         except Exception as e:
             session.rollback()
             raise e
@@ -196,8 +301,13 @@ class DatabaseManager:
     
     def get_trade_stats(self) -> Dict:
         """Get basic trade statistics"""
-        df = self.get_trades()
-        if df.empty:
+        # Aggregated inside SQLite in one query; the drawdown walks trades in the same
+        # newest-first order get_trades returns them in
+        with self.engine.connect() as conn:
+            row = conn.execute(text(TRADE_STATS_SQL)).one()
+        
+        total_trades = row.total_trades
+        if total_trades == 0:
             return {
                 'total_trades': 0,
                 'total_pnl': 0,
@@ -207,31 +317,13 @@ class DatabaseManager:
                 'max_drawdown': 0
             }
         
-        # Calculate basic stats
-        total_trades = len(df)
-        total_pnl = df['realized_pnl'].sum() + df['unrealized_pnl'].sum()
-        
-        # Win rate calculation
-        winning_trades = df[df['realized_pnl'] > 0]
-        losing_trades = df[df['realized_pnl'] < 0]
-        win_rate = len(winning_trades) / total_trades * 100 if total_trades > 0 else 0
-        
-        avg_win = winning_trades['realized_pnl'].mean() if len(winning_trades) > 0 else 0
-        avg_loss = losing_trades['realized_pnl'].mean() if len(losing_trades) > 0 else 0
-        
-        # Simple max drawdown calculation
-        cumulative_pnl = df['realized_pnl'].cumsum()
-        running_max = cumulative_pnl.expanding().max()
-        drawdown = cumulative_pnl - running_max
-        max_drawdown = drawdown.min()
-        
         return {
             'total_trades': total_trades,
-            'total_pnl': total_pnl,
-            'win_rate': win_rate,
-            'avg_win': avg_win,
-            'avg_loss': avg_loss,
-            'max_drawdown': max_drawdown
+            'total_pnl': row.total_pnl,
+            'win_rate': row.wins / total_trades * 100,
+            'avg_win': row.avg_win if row.avg_win is not None else 0,
+            'avg_loss': row.avg_loss if row.avg_loss is not None else 0,
+            'max_drawdown': row.max_drawdown
         }
     
     def export_to_csv(self, filepath: str) -> bool:
@@ -247,44 +339,112 @@ class DatabaseManager:
     def import_from_csv(self, filepath: str) -> Tuple[int, int]:
         """Import trades from CSV. Returns (successful, failed) counts"""
         try:
-            df = pd.read_csv(filepath)
-            successful = 0
-            failed = 0
-            
-            for _, row in df.iterrows():
-                try:
-                    trade_data = {
-                        'date': pd.to_datetime(row['date']),
-                        'ticker': str(row['ticker']),
-                        'asset_type': str(row.get('asset_type', 'Stock')),
-                        'trade_type': str(row['trade_type']),
-                        'price': float(row['price']),
-                        'quantity': float(row['quantity']),
-                        'fees': float(row.get('fees', 0)),
-                        'notes': str(row.get('notes', '')),
-                        'option_type': row.get('option_type'),
-                        'strike_price': row.get('strike_price'),
-                        'expiration_date': pd.to_datetime(row['expiration_date']) if pd.notna(row.get('expiration_date')) else None,
-                        'premium': row.get('premium'),
-                        'strategy': row.get('strategy')
-                    }
-                    
-                    self.add_trade(trade_data)
-                    successful += 1
-                except Exception as e:
-                    print(f"Failed to import row: {e}")
-                    failed += 1
-            
-            return successful, failed
+            import pyarrow.csv as pacsv
+            return self.import_from_arrow_table(pacsv.read_csv(filepath))
         except Exception as e:
             print(f"Import error: {e}")
             return 0, 0
     
+    def import_from_arrow_table(self, table) -> Tuple[int, int]:
+        """Import trades from a pyarrow Table (e.g. from pyarrow.csv.read_csv). Returns (successful, failed) counts"""
+        successful = 0
+        failed = 0
+        
+        # One transaction (one commit) for the whole file; each batch gets a savepoint
+        # so a bad batch is rolled back on its own. pysqlite only opens a transaction
+        # implicitly before DML, so a leading SAVEPOINT would start one of its own and its
+        # RELEASE would commit it; the outer transaction is therefore begun explicitly
+        with self.engine.connect() as conn:
+            try:
+                conn.exec_driver_sql("BEGIN")
+                for batch in table.to_batches():
+                    frame = batch.to_pandas()
+                    missing = pd.Series(None, index=frame.index, dtype=object)
+                    
+                    # Coerce each column in one vectorized call; unparseable values become NaT/NaN.
+                    # format='mixed' parses every date on its own, as the per-row import did, instead
+                    # of applying the format guessed from the first value to the whole column
+                    dates = pd.to_datetime(frame['date'], errors='coerce', format='mixed')
+                    expirations = pd.to_datetime(frame.get('expiration_date', missing), errors='coerce', format='mixed')
+                    price = pd.to_numeric(frame.get('price', missing), errors='coerce')
+                    quantity = pd.to_numeric(frame.get('quantity', missing), errors='coerce')
+                    fees = pd.to_numeric(frame.get('fees', missing), errors='coerce')
+                    ticker = frame.get('ticker', missing)
+                    trade_type = frame.get('trade_type', missing)
+                    
+                    # Rows missing a date, ticker, trade type or a numeric price/quantity are skipped;
+                    # an empty fee or expiration means none, an unparseable one rejects the row
+                    valid = (dates.notna() & price.notna() & quantity.notna() & ~_is_blank(ticker) & ~_is_blank(trade_type)
+                             & (fees.notna() | _is_blank(frame.get('fees', missing)))
+                             & (expirations.notna() | _is_blank(frame.get('expiration_date', missing))))
+                    invalid = len(frame) - int(valid.sum())
+                    if invalid:
+                        print(f"Failed to import {invalid} rows: missing or invalid values")
+                        failed += invalid
+                    
+                    # Same derived fields as _trade_row, computed per column
+                    ticker = ticker[valid].astype(str)
+                    price, quantity, fees = price[valid], quantity[valid], fees[valid].fillna(0.0)
+                    hk = ticker.str.endswith('.HK')
+                    asset_type = frame.get('asset_type', missing)[valid]
+                    notes = frame.get('notes', missing)[valid]
+                    columns = pd.DataFrame({
+                        'date': dates[valid],
+                        'ticker': ticker,
+                        'asset_type': asset_type.where(~_is_blank(asset_type), 'Stock').astype(str),
+                        'trade_type': trade_type[valid].astype(str),
+                        'price': price,
+                        'quantity': quantity,
+                        'fees': fees,
+                        'notes': notes.where(~_is_blank(notes), '').astype(str),
+                        'option_type': frame.get('option_type', missing)[valid],
+                        'strike_price': frame.get('strike_price', missing)[valid],
+                        'expiration_date': expirations[valid],
+                        'premium': frame.get('premium', missing)[valid],
+                        'strategy': frame.get('strategy', missing)[valid],
+                        'total_cost': price * quantity + fees,
+                        'currency': np.where(hk, 'HKD', 'USD'),
+                        'market': np.where(hk, 'HK', 'US')
+                    })
+                    # Missing values (NaN, NaT, empty option fields) go in as NULL
+                    columns[['option_type', 'strategy']] = columns[['option_type', 'strategy']].replace('', None)
+                    columns = columns.astype(object)
+                    rows = columns.where(columns.notna(), None).to_dict(orient='records')
+                    
+                    if not rows:
+                        continue
+                    
+                    # One executemany per record batch instead of a round-trip per row
+                    try:
+                        with conn.begin_nested():
+                            conn.execute(INSERT_TRADE, rows)
+                        successful += len(rows)
+                    except Exception as e:
+                        print(f"Failed to import batch: {e}")
+                        failed += len(rows)
+                
+                conn.commit()
+                if successful:
+                    self.version += 1
+            except Exception as e:
+                conn.rollback()
+                print(f"Import error: {e}")
+                failed += successful
+                successful = 0
+        
+        return successful, failed
+    
+    def checkpoint(self):
+        """Fold the WAL into the main database file so the file can be copied on its own"""
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    
     def backup_database(self, backup_path: str) -> bool:
         """Create a backup of the database"""
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # SQLite's online backup copies a consistent snapshot, WAL included, while other connections stay open
+            with closing(sqlite3.connect(self.db_path)) as source, closing(sqlite3.connect(backup_path)) as target:
+                source.backup(target)
             return True
         except Exception as e:
             print(f"Backup error: {e}")
@@ -293,19 +453,22 @@ class DatabaseManager:
     def restore_database(self, backup_path: str) -> bool:
         """Restore database from backup"""
         try:
-            import shutil
-            shutil.copy2(backup_path, self.db_path)
-            # Recreate tables
+            # Copy the backup's pages into the live database in one transaction
+            with closing(sqlite3.connect(backup_path)) as source, closing(sqlite3.connect(self.db_path)) as target:
+                source.backup(target)
+            # Older backups may predate newer tables or indexes
             self._create_tables()
+            self.version += 1
             return True
         except Exception as e:
             print(f"Restore error: {e}")
             return False
 
 # Sample data for testing
-def create_sample_data():
+def create_sample_data(db: Optional[DatabaseManager] = None):
     """Create sample trading data for testing"""
-    db = DatabaseManager()
+    if db is None:
+        db = DatabaseManager()
     
     sample_trades = [
         {
@@ -345,11 +508,10 @@ def create_sample_data():
         }
     ]
     
-    for trade_data in sample_trades:
-        try:
-            db.add_trade(trade_data)
-        except Exception as e:
-            print(f"Error adding sample trade: {e}")
+    try:
+        db.add_trades(sample_trades)
+    except Exception as e:
+        print(f"Error adding sample trades: {e}")
 
 if __name__ == "__main__":
     # Test database functionality
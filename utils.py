@@ -7,12 +7,129 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-import yfinance as yf
 import os
 import zipfile
 import json
+import time
+import threading
+from types import MappingProxyType
+from numba import njit, prange
 from data import DatabaseManager
 
+# Journals larger than this use the multi-threaded reduction kernel
+PARALLEL_METRICS_THRESHOLD = 5000
+
+# Live quotes are reused for this many seconds before yfinance is asked again
+PRICE_CACHE_TTL = 60
+_price_cache: Dict[str, Tuple[float, float]] = {}  # ticker -> (fetched at, price)
+
+# calculate_metrics results for the most recently seen journals, keyed by content
+METRICS_CACHE_SIZE = 8
+_metrics_cache: Dict[Tuple, Dict] = {}
+_metrics_lock = threading.Lock()  # Streamlit sessions run on concurrent script threads
+
+@njit(cache=True)
+def _pnl_sums(realized: np.ndarray, unrealized: np.ndarray) -> Tuple[float, int, int, int, float, float]:
+    """Single pass over the P&L arrays.
+    
+    Returns (total_pnl, closed_trades, wins, losses, sum_wins, sum_losses).
+    NaN entries are skipped in sums, matching pandas' skipna behaviour.
+    """
+    total = 0.0
+    for i in range(unrealized.size):
+        if unrealized[i] == unrealized[i]:
+            total += unrealized[i]
+    
+    n_closed = 0
+    n_wins = 0
+    n_losses = 0
+    sum_wins = 0.0
+    sum_losses = 0.0
+    for i in range(realized.size):
+        pnl = realized[i]
+        if pnl != 0:
+            n_closed += 1
+        if pnl > 0:
+            n_wins += 1
+            sum_wins += pnl
+        elif pnl < 0:
+            n_losses += 1
+            sum_losses += pnl
+        if pnl == pnl:
+            total += pnl
+    return total, n_closed, n_wins, n_losses, sum_wins, sum_losses
+
+@njit(parallel=True, cache=True)
+def _pnl_sums_parallel(realized: np.ndarray, unrealized: np.ndarray) -> Tuple[float, int, int, int, float, float]:
+    """Multi-threaded version of _pnl_sums; each accumulator is a prange reduction"""
+    total = 0.0
+    for i in prange(unrealized.size):
+        if unrealized[i] == unrealized[i]:
+            total += unrealized[i]
+    
+    n_closed = 0
+    n_wins = 0
+    n_losses = 0
+    sum_wins = 0.0
+    sum_losses = 0.0
+    for i in prange(realized.size):
+        pnl = realized[i]
+        if pnl != 0:
+            n_closed += 1
+        if pnl > 0:
+            n_wins += 1
+            sum_wins += pnl
+        elif pnl < 0:
+            n_losses += 1
+            sum_losses += pnl
+        if pnl == pnl:
+            total += pnl
+    return total, n_closed, n_wins, n_losses, sum_wins, sum_losses
+
+@njit(cache=True)
+def _max_drawdown(realized: np.ndarray) -> float:
+    """Largest peak-to-trough drop of the cumulative P&L (sequential by nature)"""
+    cumulative = 0.0
+    running_max = -np.inf
+    max_drawdown = 0.0
+    for i in range(realized.size):
+        if realized[i] != realized[i]:
+            continue
+        cumulative += realized[i]
+        if cumulative > running_max:
+            running_max = cumulative
+        if cumulative - running_max < max_drawdown:
+            max_drawdown = cumulative - running_max
+    return max_drawdown
+
+@njit(cache=True)
+def _position_pnl(group_start: np.ndarray, is_buy: np.ndarray, price: np.ndarray, quantity: np.ndarray,
+                  cost: np.ndarray, fees: np.ndarray) -> np.ndarray:
+    """Running realized P&L per ticker with average-cost accounting.
+    
+    Rows are grouped by ticker and date-ordered within each group; group_start
+    marks the first row of a ticker, where position and cost reset.
+    """
+    realized = np.empty(price.size)
+    position = 0.0
+    total_cost = 0.0
+    realized_pnl = 0.0
+    for i in range(price.size):
+        if group_start[i]:
+            position = 0.0
+            total_cost = 0.0
+            realized_pnl = 0.0
+        if is_buy[i]:
+            position += quantity[i]
+            total_cost += cost[i]
+        elif position > 0:
+            avg_cost = total_cost / position
+            realized_pnl += (price[i] - avg_cost) * quantity[i] - fees[i]
+            position -= quantity[i]
+            total_cost = total_cost * (position / (position + quantity[i])) if position > 0 else 0.0
+        realized[i] = realized_pnl
+    return realized
+
 class TradingCalculator:
     """Handles trading calculations and metrics"""
     
@@ -20,34 +137,37 @@ class TradingCalculator:
     def calculate_pnl(trades_df: pd.DataFrame) -> pd.DataFrame:
         """Calculate P&L for trades"""
         df = trades_df.copy()
+        if df.empty:
+            return df
         
-        # Group by ticker to calculate position-based P&L
-        for ticker in df['ticker'].unique():
-            ticker_trades = df[df['ticker'] == ticker].sort_values('date')
-            
-            position = 0
-            total_cost = 0
-            realized_pnl = 0
-            
-            for idx, trade in ticker_trades.iterrows():
-                if trade['trade_type'] == 'Buy':
-                    position += trade['quantity']
-                    total_cost += trade['total_cost']
-                else:  # Sell
-                    if position > 0:
-                        # Calculate average cost
-                        avg_cost = total_cost / position if position > 0 else 0
-                        # Calculate P&L for this sell
-                        trade_pnl = (trade['price'] - avg_cost) * trade['quantity'] - trade['fees']
-                        realized_pnl += trade_pnl
-                        
-                        # Update position and cost
-                        position -= trade['quantity']
-                        total_cost = total_cost * (position / (position + trade['quantity'])) if position > 0 else 0
-                
-                # Update the dataframe
-                df.loc[idx, 'realized_pnl'] = realized_pnl
-                df.loc[idx, 'unrealized_pnl'] = 0  # Will be calculated with live prices
+        # Order rows by (ticker, date) with a stable sort; trades without a ticker are left as they are
+        codes, _ = pd.factorize(df['ticker'])
+        dates = df['date'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        dates = np.where(dates == np.iinfo(np.int64).min, np.iinfo(np.int64).max, dates)  # NaT sorts last
+        order = np.lexsort((dates, codes))
+        order = order[codes[order] >= 0]
+        
+        sorted_codes = codes[order]
+        group_start = np.empty(order.size, dtype=np.bool_)
+        group_start[:1] = True
+        group_start[1:] = sorted_codes[1:] != sorted_codes[:-1]
+        
+        # Position-based P&L in one compiled pass over all tickers
+        pnl = _position_pnl(
+            group_start,
+            df['trade_type'].to_numpy()[order] == 'Buy',
+            df['price'].to_numpy(dtype=np.float64)[order],
+            df['quantity'].to_numpy(dtype=np.float64)[order],
+            df['total_cost'].to_numpy(dtype=np.float64)[order],
+            df['fees'].to_numpy(dtype=np.float64)[order]
+        )
+        
+        realized = df['realized_pnl'].to_numpy(dtype=np.float64, copy=True) if 'realized_pnl' in df else np.full(len(df), np.nan)
+        unrealized = df['unrealized_pnl'].to_numpy(dtype=np.float64, copy=True) if 'unrealized_pnl' in df else np.full(len(df), np.nan)
+        realized[order] = pnl
+        unrealized[order] = 0  # Will be calculated with live prices
+        df['realized_pnl'] = realized
+        df['unrealized_pnl'] = unrealized
         
         return df
     
@@ -55,6 +175,8 @@ class TradingCalculator:
     def get_live_price(ticker: str) -> Optional[float]:
         """Get live price for a ticker using yfinance"""
         try:
+            import yfinance as yf
+            
             # Handle HK stocks
             if ticker.endswith('.HK'):
                 ticker_symbol = ticker
@@ -68,29 +190,73 @@ class TradingCalculator:
             print(f"Error getting live price for {ticker}: {e}")
             return None
     
+    @staticmethod
+    def get_live_prices(tickers: List[str]) -> Dict[str, float]:
+        """Latest prices for several tickers with one yfinance download; recent quotes come from cache"""
+        now = time.monotonic()
+        prices = {}
+        for ticker in tickers:
+            cached = _price_cache.get(ticker)
+            if cached is not None and now - cached[0] < PRICE_CACHE_TTL:
+                prices[ticker] = cached[1]
+        stale = [ticker for ticker in tickers if ticker not in prices]
+        if not stale:
+            return prices
+        
+        try:
+            import yfinance as yf
+            
+            quotes = yf.download(stale, period='5d', interval='1d', progress=False, threads=True, auto_adjust=False)
+            closes = quotes['Close']
+            if isinstance(closes, pd.Series):  # older yfinance: flat columns for a single ticker
+                closes = closes.to_frame(stale[0])
+            # Last close per ticker; forward-fill so a ticker without a bar today keeps its previous one
+            closes = closes.ffill().iloc[-1]
+            for ticker in stale:
+                price = closes.get(ticker)
+                if price is not None and pd.notna(price):
+                    prices[ticker] = float(price)
+                    _price_cache[ticker] = (now, float(price))
+        except Exception as e:
+            print(f"Error getting live prices for {', '.join(stale)}: {e}")
+        return prices
+    
     @staticmethod
     def calculate_unrealized_pnl(trades_df: pd.DataFrame) -> pd.DataFrame:
         """Calculate unrealized P&L using live prices"""
         df = trades_df.copy()
         
-        for ticker in df['ticker'].unique():
-            ticker_trades = df[df['ticker'] == ticker].sort_values('date')
-            
-            # Calculate current position
-            position = ticker_trades[ticker_trades['trade_type'] == 'Buy']['quantity'].sum() - \
-                      ticker_trades[ticker_trades['trade_type'] == 'Sell']['quantity'].sum()
-            
-            if position > 0:  # Long position
-                # Calculate average cost
-                buy_trades = ticker_trades[ticker_trades['trade_type'] == 'Buy']
-                total_cost = buy_trades['total_cost'].sum()
-                avg_cost = total_cost / buy_trades['quantity'].sum()
-                
-                # Get live price
-                live_price = TradingCalculator.get_live_price(ticker)
-                if live_price:
-                    unrealized_pnl = (live_price - avg_cost) * position
-                    df.loc[df['ticker'] == ticker, 'unrealized_pnl'] = unrealized_pnl
+        # Per-ticker bought/sold quantity and buy cost in one bincount pass each
+        codes, tickers = pd.factorize(df['ticker'])
+        valid = codes >= 0
+        trade_type = df['trade_type'].to_numpy()
+        buys = valid & (trade_type == 'Buy')
+        sells = valid & (trade_type == 'Sell')
+        quantity = np.nan_to_num(df['quantity'].to_numpy(dtype=np.float64))
+        bought = np.bincount(codes[buys], weights=quantity[buys], minlength=len(tickers))
+        sold = np.bincount(codes[sells], weights=quantity[sells], minlength=len(tickers))
+        buy_cost = np.bincount(codes[buys], weights=np.nan_to_num(df['total_cost'].to_numpy(dtype=np.float64))[buys],
+                               minlength=len(tickers))
+        position = bought - sold
+        
+        # Quotes only for long positions, all in one request
+        long = np.flatnonzero(position > 0)
+        live_prices = TradingCalculator.get_live_prices([str(tickers[i]) for i in long])
+        
+        unrealized = np.zeros(len(tickers))
+        has_price = np.zeros(len(tickers), dtype=np.bool_)
+        for i in long:
+            live_price = live_prices.get(str(tickers[i]))
+            if live_price:
+                avg_cost = buy_cost[i] / bought[i]
+                unrealized[i] = (live_price - avg_cost) * position[i]
+                has_price[i] = True
+        
+        # Every trade of a priced ticker carries that ticker's unrealized P&L
+        priced = valid.copy()
+        priced[valid] = has_price[codes[valid]]
+        if priced.any():
+            df.loc[priced, 'unrealized_pnl'] = unrealized[codes[priced]]
         
         return df
     
@@ -100,20 +266,18 @@ class TradingCalculator:
         if trades_df.empty:
             return {}
         
-        # Basic metrics
+        # Basic metrics and win/loss analysis in one compiled pass
         total_trades = len(trades_df)
-        total_pnl = trades_df['realized_pnl'].sum() + trades_df['unrealized_pnl'].sum()
+        realized = trades_df['realized_pnl'].to_numpy(dtype=np.float64)
+        unrealized = trades_df['unrealized_pnl'].to_numpy(dtype=np.float64)
+        pnl_sums = _pnl_sums_parallel if total_trades > PARALLEL_METRICS_THRESHOLD else _pnl_sums
+        total_pnl, closed_trades, n_wins, n_losses, sum_wins, sum_losses = pnl_sums(realized, unrealized)
         
-        # Win/Loss analysis
-        realized_trades = trades_df[trades_df['realized_pnl'] != 0]
-        if not realized_trades.empty:
-            winning_trades = realized_trades[realized_trades['realized_pnl'] > 0]
-            losing_trades = realized_trades[realized_trades['realized_pnl'] < 0]
-            
-            win_rate = len(winning_trades) / len(realized_trades) * 100
-            avg_win = winning_trades['realized_pnl'].mean() if len(winning_trades) > 0 else 0
-            avg_loss = losing_trades['realized_pnl'].mean() if len(losing_trades) > 0 else 0
-            profit_factor = abs(winning_trades['realized_pnl'].sum() / losing_trades['realized_pnl'].sum()) if len(losing_trades) > 0 and losing_trades['realized_pnl'].sum() != 0 else float('inf')
+        if closed_trades > 0:
+            win_rate = n_wins / closed_trades * 100
+            avg_win = sum_wins / n_wins if n_wins > 0 else 0
+            avg_loss = sum_losses / n_losses if n_losses > 0 else 0
+            profit_factor = abs(sum_wins / sum_losses) if sum_losses != 0 else float('inf')
         else:
             win_rate = 0
             avg_win = 0
@@ -121,15 +285,19 @@ class TradingCalculator:
             profit_factor = 0
         
         # Drawdown calculation
-        cumulative_pnl = trades_df['realized_pnl'].cumsum()
-        running_max = cumulative_pnl.expanding().max()
-        drawdown = cumulative_pnl - running_max
-        max_drawdown = drawdown.min()
+        max_drawdown = _max_drawdown(realized)
         
         # Sharpe ratio (simplified)
-        if len(realized_trades) > 1:
-            returns = realized_trades['realized_pnl'].pct_change().dropna()
-            sharpe_ratio = returns.mean() / returns.std() * np.sqrt(252) if returns.std() != 0 else 0
+        if closed_trades > 1:
+            # Trade-to-trade change of the non-zero P&L; non-finite pairs (NaN neighbours) drop out like dropna()
+            nonzero = realized[realized != 0]
+            returns = (nonzero[1:] - nonzero[:-1]) / nonzero[:-1]
+            returns = returns[np.isfinite(returns)]
+            if returns.size > 1:
+                std = returns.std(ddof=1)
+                sharpe_ratio = returns.mean() / std * np.sqrt(252) if std != 0 else 0
+            else:
+                sharpe_ratio = np.nan
         else:
             sharpe_ratio = 0
         
@@ -137,9 +305,10 @@ class TradingCalculator:
         largest_win = trades_df['realized_pnl'].max() if not trades_df.empty else 0
         largest_loss = trades_df['realized_pnl'].min() if not trades_df.empty else 0
         
-        # Monthly returns
-        trades_df['month'] = trades_df['date'].dt.to_period('M')
-        monthly_pnl = trades_df.groupby('month')['realized_pnl'].sum()
+        # Monthly returns, grouped on a derived datetime64[M] key (no Period objects,
+        # and no column added to the caller's frame)
+        month = trades_df['date'].to_numpy(dtype='datetime64[M]')
+        monthly_pnl = trades_df.groupby(month)['realized_pnl'].sum()
         best_month = monthly_pnl.max() if not monthly_pnl.empty else 0
         worst_month = monthly_pnl.min() if not monthly_pnl.empty else 0
         
@@ -160,6 +329,27 @@ class TradingCalculator:
             'avg_trade_size': trades_df['total_cost'].mean()
         }
     
+    @staticmethod
+    def cached_metrics(trades_df: pd.DataFrame) -> Dict:
+        """calculate_metrics, reused while the columns it reads are unchanged"""
+        if trades_df.empty:
+            return {}
+        
+        # Hash the raw bytes of every column calculate_metrics depends on
+        key = (len(trades_df),) + tuple(
+            hash(trades_df[col].to_numpy().tobytes())
+            for col in ('date', 'realized_pnl', 'unrealized_pnl', 'total_cost')
+        )
+        with _metrics_lock:
+            metrics = _metrics_cache.get(key)
+        if metrics is None:
+            metrics = TradingCalculator.calculate_metrics(trades_df)
+            with _metrics_lock:
+                if len(_metrics_cache) >= METRICS_CACHE_SIZE:
+                    del _metrics_cache[next(iter(_metrics_cache))]
+                _metrics_cache[key] = metrics
+        return dict(metrics)
+    
     @staticmethod
     def calculate_risk_metrics(account_value: float, trade_data: Dict) -> Dict:
         """Calculate risk management metrics"""
@@ -192,6 +382,34 @@ class TradingCalculator:
 class DataExporter:
     """Handles data export and backup functionality"""
     
+    @staticmethod
+    def export_to_csv_bytes(trades_df: pd.DataFrame) -> Optional[bytes]:
+        """Export trades as CSV bytes using Arrow's native CSV writer"""
+        try:
+            import io
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+            
+            buffer = io.BytesIO()
+            pacsv.write_csv(pa.Table.from_pandas(trades_df, preserve_index=False), buffer)
+            return buffer.getvalue()
+        except Exception as e:
+            print(f"CSV export error: {e}")
+            return None
+    
+    @staticmethod
+    def export_to_parquet_bytes(trades_df: pd.DataFrame) -> Optional[bytes]:
+        """Export trades as zstd-compressed Parquet bytes, keeping column dtypes"""
+        try:
+            import io
+            
+            buffer = io.BytesIO()
+            trades_df.to_parquet(buffer, engine='pyarrow', compression='zstd', index=False)
+            return buffer.getvalue()
+        except Exception as e:
+            print(f"Parquet export error: {e}")
+            return None
+    
     @staticmethod
     def export_to_excel(trades_df: pd.DataFrame, filepath: str) -> bool:
         """Export trades to Excel file"""
@@ -210,13 +428,22 @@ class DataExporter:
             return False
     
     @staticmethod
-    def create_backup_zip(db_path: str, backup_path: str) -> bool:
-        """Create a ZIP backup of the database and related files"""
+    def create_backup_zip(db_path: str, backup_path: str, compresslevel: int = 1) -> bool:
+        """Create a ZIP backup of the database and related files.
+        
+        compresslevel 1 (the default) deflates at a fraction of the CPU cost of the
+        usual level 6; 0 stores files uncompressed.
+        """
         try:
-            with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                # Add database file
+            compression = zipfile.ZIP_DEFLATED if compresslevel > 0 else zipfile.ZIP_STORED
+            with zipfile.ZipFile(backup_path, 'w', compression,
+                                 compresslevel=compresslevel or None, allowZip64=True) as zipf:
+                # Add database file, plus any write-ahead log not yet checkpointed into it
                 if os.path.exists(db_path):
                     zipf.write(db_path, 'trades.db')
+                    wal_path = f"{db_path}-wal"
+                    if os.path.exists(wal_path) and os.path.getsize(wal_path) > 0:
+                        zipf.write(wal_path, 'trades.db-wal')
                 
                 # Add any other important files
                 for file in ['app.py', 'data.py', 'charts.py', 'utils.py']:
@@ -243,17 +470,20 @@ class AIInsights:
     """Basic rule-based AI insights for trading patterns"""
     
     @staticmethod
-    def generate_insights(trades_df: pd.DataFrame) -> List[str]:
-        """Generate basic trading insights"""
+    def generate_insights(trades_df: pd.DataFrame, ticker_pnl: Optional[pd.Series] = None) -> List[str]:
+        """Generate basic trading insights; pass ticker_pnl (realized P&L per ticker) if already computed"""
         insights = []
         
         if trades_df.empty:
             return ["No trades found. Start by adding your first trade!"]
         
-        # Win rate insights
-        realized_trades = trades_df[trades_df['realized_pnl'] != 0]
-        if not realized_trades.empty:
-            win_rate = len(realized_trades[realized_trades['realized_pnl'] > 0]) / len(realized_trades) * 100
+        # Win rate insights (boolean masks over the raw array, no filtered frames)
+        pnl = trades_df['realized_pnl'].to_numpy(dtype=np.float64)
+        closed = pnl != 0
+        wins = pnl > 0
+        losses = pnl < 0
+        if closed.any():
+            win_rate = np.count_nonzero(wins) / np.count_nonzero(closed) * 100
             
             if win_rate >= 60:
                 insights.append(f"🎯 Excellent win rate of {win_rate:.1f}%! You're making good trading decisions.")
@@ -263,11 +493,8 @@ class AIInsights:
                 insights.append(f"⚠️ Win rate of {win_rate:.1f}% needs improvement. Review your trading strategy.")
         
         # Profit factor insights
-        winning_trades = realized_trades[realized_trades['realized_pnl'] > 0]
-        losing_trades = realized_trades[realized_trades['realized_pnl'] < 0]
-        
-        if len(losing_trades) > 0 and len(winning_trades) > 0:
-            profit_factor = abs(winning_trades['realized_pnl'].sum() / losing_trades['realized_pnl'].sum())
+        if losses.any() and wins.any():
+            profit_factor = abs(pnl[wins].sum() / pnl[losses].sum())
             
             if profit_factor >= 2.0:
                 insights.append(f"💰 Strong profit factor of {profit_factor:.2f}. Your winners are significantly larger than losers.")
@@ -277,10 +504,7 @@ class AIInsights:
                 insights.append(f"📉 Profit factor of {profit_factor:.2f} suggests your losses are too large relative to wins.")
         
         # Drawdown insights
-        cumulative_pnl = trades_df['realized_pnl'].cumsum()
-        running_max = cumulative_pnl.expanding().max()
-        drawdown = cumulative_pnl - running_max
-        max_drawdown = drawdown.min()
+        max_drawdown = _max_drawdown(pnl)
         
         if max_drawdown < -0.1:  # 10% drawdown
             insights.append(f"⚠️ Maximum drawdown of {max_drawdown:.1%} is concerning. Consider reducing position sizes.")
@@ -299,43 +523,37 @@ class AIInsights:
             elif trades_per_day < 0.1:
                 insights.append(f"🐌 Low trading frequency of {trades_per_day:.1f} trades/day. More opportunities might be available.")
         
-        # Best performing ticker
-        ticker_pnl = trades_df.groupby('ticker')['realized_pnl'].sum().sort_values(ascending=False)
-        if not ticker_pnl.empty and ticker_pnl.iloc[0] > 0:
-            best_ticker = ticker_pnl.index[0]
-            insights.append(f"🏆 {best_ticker} is your best performer with ${ticker_pnl.iloc[0]:.2f} profit.")
+        # Best performing ticker (only the extremes are needed, so no sort)
+        if ticker_pnl is None:
+            ticker_pnl = trades_df.groupby('ticker', observed=True)['realized_pnl'].sum()
+        if not ticker_pnl.empty and ticker_pnl.max() > 0:
+            best_ticker = ticker_pnl.idxmax()
+            insights.append(f"🏆 {best_ticker} is your best performer with ${ticker_pnl.max():.2f} profit.")
         
         # Worst performing ticker
-        if not ticker_pnl.empty and ticker_pnl.iloc[-1] < 0:
-            worst_ticker = ticker_pnl.index[-1]
-            insights.append(f"📉 {worst_ticker} is your worst performer with ${ticker_pnl.iloc[-1]:.2f} loss.")
+        if not ticker_pnl.empty and ticker_pnl.min() < 0:
+            worst_ticker = ticker_pnl.idxmin()
+            insights.append(f"📉 {worst_ticker} is your worst performer with ${ticker_pnl.min():.2f} loss.")
         
         return insights
 
 class CurrencyConverter:
     """Handles currency conversion for international trades"""
     
+    # For demo purposes, using fixed rates
+    # In production, you'd use a real API like exchangerate-api.com
+    _RATES = MappingProxyType({
+        'USD_HKD': 7.8,
+        'HKD_USD': 1/7.8,
+        'USD_EUR': 0.85,
+        'EUR_USD': 1/0.85
+    })
+    
     @staticmethod
     def get_exchange_rate(from_currency: str, to_currency: str) -> float:
         """Get exchange rate between currencies"""
-        try:
-            if from_currency == to_currency:
-                return 1.0
-            
-            # For demo purposes, using fixed rates
-            # In production, you'd use a real API like exchangerate-api.com
-            rates = {
-                'USD_HKD': 7.8,
-                'HKD_USD': 1/7.8,
-                'USD_EUR': 0.85,
-                'EUR_USD': 1/0.85
-            }
-            
-            key = f"{from_currency}_{to_currency}"
-            return rates.get(key, 1.0)
-        except Exception as e:
-            print(f"Currency conversion error: {e}")
-            return 1.0
+        # Same-currency and unknown pairs fall through to 1.0
+        return CurrencyConverter._RATES.get(f"{from_currency}_{to_currency}", 1.0)
     
     @staticmethod
     def convert_amount(amount: float, from_currency: str, to_currency: str) -> float: